@@ -0,0 +1,225 @@
+import sys
+import os
+import glob
+import json
+import time
+import hashlib
+import datetime
+import statistics
+import subprocess
+import tracemalloc
+from playwright.sync_api import sync_playwright
+
+import rastreador
+from rastreador import SELETORES, EXTRATOR_JS, plataforma_do_arquivo, vagas_do_html, montar_vagas
+
+# ================================================================
+# CONFIGURAÇÃO
+# ================================================================
+SNAPSHOTS   = ["debug_*.html", "fixtures/*.html"]
+ITERACOES   = 20
+RESULTADOS  = "benchmark_resultados.jsonl"   # uma linha JSON por execução
+
+# Tempo de cada seletor de campo aplicado a todos os cards, medido no próprio navegador
+LATENCIA_CAMPOS_JS = """
+([seletorCard, campos, repeticoes]) => {
+    const cards = Array.from(document.querySelectorAll(seletorCard));
+    const tempos = {};
+    for (const [campo, lista] of Object.entries(campos)) {
+        tempos[campo] = {};
+        for (const sel of lista) {
+            let achados = 0;
+            const inicio = performance.now();
+            for (let r = 0; r < repeticoes; r++) {
+                for (const card of cards) {
+                    let el = null;
+                    try { el = card.querySelector(sel); } catch (e) { break; }
+                    if (el && r === 0) achados++;
+                }
+            }
+            tempos[campo][sel] = {ms: (performance.now() - inicio) / repeticoes, cards: achados};
+        }
+    }
+    return tempos;
+}
+"""
+
+HEAP_JS = "() => (performance.memory ? performance.memory.usedJSHeapSize : null)"
+
+
+# ================================================================
+# UTILITÁRIOS
+# ================================================================
+def versao():
+    """Commit atual + hash do rastreador.py (para comparar execuções)."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        commit = ""
+    with open(rastreador.__file__, "rb") as f:
+        sha = hashlib.sha1(f.read()).hexdigest()[:12]
+    return {'commit': commit, 'rastreador_sha1': sha}
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    k = min(len(ordenados) - 1, round(p / 100 * (len(ordenados) - 1)))
+    return ordenados[k]
+
+def resumo_tempos(tempos_ms):
+    return {
+        'p50_ms':  round(statistics.median(tempos_ms), 3),
+        'p95_ms':  round(percentil(tempos_ms, 95), 3),
+        'min_ms':  round(min(tempos_ms), 3),
+    }
+
+def listar_snapshots(args):
+    padroes = args or SNAPSHOTS
+    arquivos = []
+    for padrao in padroes:
+        arquivos.extend(sorted(glob.glob(padrao)))
+    return [a for a in arquivos if os.path.getsize(a) > 0]
+
+
+# ================================================================
+# MEDIÇÕES
+# ================================================================
+def medir_navegador(page, plataforma, html):
+    """Extração em lote (EXTRATOR_JS) sobre o snapshot carregado via set_content."""
+    page.set_content(html, wait_until="domcontentloaded")
+    campos = {c: l for c, l in SELETORES[plataforma].items() if c != "card"}
+
+    seletor = next(
+        (s for s in SELETORES[plataforma]['card'] if page.evaluate(
+            "(s) => { try { return document.querySelectorAll(s).length } catch (e) { return 0 } }", s)),
+        None
+    )
+    resultado = {'seletor_card': seletor, 'cards': 0, 'heap_js_bytes': page.evaluate(HEAP_JS)}
+    if not seletor:
+        return resultado
+
+    tempos, brutos = [], []
+    for _ in range(ITERACOES):
+        inicio = time.perf_counter()
+        brutos = page.evaluate(EXTRATOR_JS, [seletor, campos])
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+    inicio = time.perf_counter()
+    vagas = montar_vagas(brutos, plataforma, "", "")
+    montagem_ms = (time.perf_counter() - inicio) * 1000
+
+    total_s = sum(tempos) / 1000
+    resultado.update({
+        'cards':           len(brutos),
+        'vagas':           len(vagas),
+        'extracao':        resumo_tempos(tempos),
+        'cards_por_s':     round(len(brutos) * ITERACOES / total_s, 1) if total_s else None,
+        'montagem_ms':     round(montagem_ms, 3),
+        'latencia_campos': page.evaluate(LATENCIA_CAMPOS_JS, [seletor, campos, ITERACOES]),
+        'heap_js_bytes':   page.evaluate(HEAP_JS),
+    })
+    return resultado
+
+def medir_offline(plataforma, html):
+    """Parser em Python puro (extrator_html), com pico de memória via tracemalloc."""
+    tempos, vagas = [], []
+    for _ in range(ITERACOES):
+        inicio = time.perf_counter()
+        vagas, _ = vagas_do_html(html, plataforma)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+    tracemalloc.start()
+    vagas_do_html(html, plataforma)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'vagas': len(vagas), 'parse': resumo_tempos(tempos), 'pico_memoria_bytes': pico}
+
+
+# ================================================================
+# COMPARAÇÃO COM A EXECUÇÃO ANTERIOR
+# ================================================================
+def ultima_execucao():
+    if not os.path.exists(RESULTADOS):
+        return None
+    with open(RESULTADOS, encoding="utf-8") as f:
+        linhas = [l for l in f if l.strip()]
+    return json.loads(linhas[-1]) if linhas else None
+
+def comparar(anterior, atual):
+    if not anterior:
+        return
+    print(f"\n  Comparado com {anterior['versao'].get('commit') or '?'} ({anterior['gerado_em']}):")
+    for arquivo, dados in atual['snapshots'].items():
+        antes = anterior['snapshots'].get(arquivo)
+        if not antes:
+            continue
+        for motor, chave in (('navegador', 'extracao'), ('offline', 'parse')):
+            a = (antes.get(motor) or {}).get(chave, {}).get('p50_ms')
+            b = (dados.get(motor) or {}).get(chave, {}).get('p50_ms')
+            if a and b:
+                delta = (b - a) / a * 100
+                alerta = "  ⚠️ regressão" if delta > 20 else ""
+                print(f"    {arquivo:28s} {motor:9s} p50 {a:8.2f} → {b:8.2f} ms ({delta:+.0f}%){alerta}")
+
+
+# ================================================================
+# ENTRADA
+# ================================================================
+def main(args):
+    arquivos = listar_snapshots([a for a in args if not a.startswith("--")])
+    if not arquivos:
+        print("\n Nenhum snapshot encontrado (debug_*.html / fixtures/*.html).")
+        return
+
+    resultado = {
+        'gerado_em': datetime.datetime.now().isoformat(timespec="seconds"),
+        'versao':    versao(),
+        'iteracoes': ITERACOES,
+        'snapshots': {},
+    }
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        # Snapshot congelado: sem JS da página e sem rede
+        context = browser.new_context(java_script_enabled=False)
+        context.route("**/*", lambda route: route.abort())
+        page = context.new_page()
+
+        for arquivo in arquivos:
+            plataforma = plataforma_do_arquivo(arquivo)
+            if not plataforma:
+                print(f"  ⚠️ {arquivo}: plataforma não reconhecida — ignorado")
+                continue
+            with open(arquivo, encoding="utf-8") as f:
+                html = f.read()
+
+            navegador = medir_navegador(page, plataforma, html)
+            offline   = medir_offline(plataforma, html)
+            resultado['snapshots'][arquivo] = {
+                'plataforma': plataforma,
+                'bytes':      len(html.encode("utf-8")),
+                'navegador':  navegador,
+                'offline':    offline,
+            }
+
+            extracao = navegador.get('extracao', {}).get('p50_ms', 0)
+            print(f"  {arquivo:28s} {plataforma:10s} {navegador['cards']:3d} cards | "
+                  f"navegador p50 {extracao:7.2f} ms | offline p50 {offline['parse']['p50_ms']:7.2f} ms | "
+                  f"pico {offline['pico_memoria_bytes'] / 1_048_576:5.1f} MB")
+
+        browser.close()
+
+    comparar(ultima_execucao(), resultado)
+    with open(RESULTADOS, "a", encoding="utf-8") as f:
+        f.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+    print(f"\n  Resultados anexados em {os.path.abspath(RESULTADOS)}\n")
+
+
+if __name__ == "__main__":
+    # python benchmark.py                      → todos os snapshots
+    # python benchmark.py debug_gupy.html ...  → só os indicados
+    main(sys.argv[1:])
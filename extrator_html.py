@@ -0,0 +1,264 @@
+"""
+Extração de cards a partir de HTML estático — sem navegador.
+
+Monta uma árvore leve com html.parser (biblioteca padrão) e aplica o mesmo
+subconjunto de CSS usado em SELETORES (tag, #id, .classe, [attr], [attr=v],
+[attr*=v], [attr^=v], [attr$=v], [attr~=v], descendente e '>'), devolvendo
+os cards no mesmo formato do extrator em lote do navegador.
+"""
+import re
+from html import escape
+from html.parser import HTMLParser
+
+VOID = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+# Conteúdo que não aparece no innerText
+INVISIVEIS = {"script", "style", "noscript", "template", "head", "svg"}
+BLOCOS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3",
+    "h4", "h5", "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre",
+    "section", "table", "tr", "ul",
+}
+# Tags que o HTML fecha implicitamente ao abrir uma irmã
+FECHA_IMPLICITO = {"li": {"li"}, "p": {"p"}, "tr": {"tr"}, "td": {"td", "th"},
+                   "th": {"td", "th"}, "option": {"option"}}
+
+
+class Elemento:
+    __slots__ = ("tag", "attrs", "filhos", "pai")
+
+    def __init__(self, tag, attrs=None, pai=None):
+        self.tag    = tag
+        self.attrs  = attrs or {}
+        self.filhos = []   # Elemento ou str
+        self.pai    = pai
+
+    def get(self, nome):
+        return self.attrs.get(nome)
+
+    def descendentes(self):
+        pilha = [f for f in reversed(self.filhos) if isinstance(f, Elemento)]
+        while pilha:
+            el = pilha.pop()
+            yield el
+            pilha.extend(f for f in reversed(el.filhos) if isinstance(f, Elemento))
+
+    def select(self, seletor):
+        """Equivalente a querySelectorAll (ordem do documento)."""
+        alternativas = compilar_seletor(seletor)
+        return [el for el in self.descendentes()
+                if any(_casa(el, cadeia, len(cadeia) - 1) for cadeia in alternativas)]
+
+    def select_one(self, seletor):
+        alternativas = compilar_seletor(seletor)
+        for el in self.descendentes():
+            if any(_casa(el, cadeia, len(cadeia) - 1) for cadeia in alternativas):
+                return el
+        return None
+
+    def texto(self):
+        """Aproximação do innerText: quebras de linha nos blocos, espaços colapsados."""
+        partes = []
+        self._coletar_texto(partes)
+        linhas = "".join(partes).split("\n")
+        return "\n".join(l for l in (" ".join(l.split()) for l in linhas) if l)
+
+    def html(self):
+        """Equivalente ao outerHTML (atributos normalizados, fechamentos explícitos)."""
+        partes = []
+        self._serializar(partes)
+        return "".join(partes)
+
+    def _serializar(self, partes):
+        attrs = "".join(f' {k}="{escape(v)}"' for k, v in self.attrs.items())
+        partes.append(f"<{self.tag}{attrs}>")
+        if self.tag in VOID:
+            return
+        for f in self.filhos:
+            if isinstance(f, str):
+                partes.append(f if self.tag in ("script", "style") else escape(f, quote=False))
+            else:
+                f._serializar(partes)
+        partes.append(f"</{self.tag}>")
+
+    def _coletar_texto(self, partes):
+        if self.tag in INVISIVEIS:
+            return
+        if self.tag == "br":
+            partes.append("\n")
+            return
+        bloco = self.tag in BLOCOS
+        if bloco: partes.append("\n")
+        for f in self.filhos:
+            if isinstance(f, str):
+                partes.append(f)
+            else:
+                f._coletar_texto(partes)
+        if bloco: partes.append("\n")
+
+
+class _Construtor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.raiz  = Elemento("#document")
+        self.atual = self.raiz
+
+    def handle_starttag(self, tag, attrs):
+        fecha = FECHA_IMPLICITO.get(tag)
+        if fecha:
+            el = self.atual
+            while el is not self.raiz and el.tag not in ("ul", "ol", "table", "select", "div"):
+                if el.tag in fecha:
+                    self.atual = el.pai
+                    break
+                el = el.pai
+        novo = Elemento(tag, {k: (v if v is not None else "") for k, v in attrs}, self.atual)
+        self.atual.filhos.append(novo)
+        if tag not in VOID:
+            self.atual = novo
+
+    def handle_startendtag(self, tag, attrs):
+        self.atual.filhos.append(
+            Elemento(tag, {k: (v if v is not None else "") for k, v in attrs}, self.atual))
+
+    def handle_endtag(self, tag):
+        el = self.atual
+        while el is not self.raiz:
+            if el.tag == tag:
+                self.atual = el.pai
+                return
+            el = el.pai
+        # fechamento sem abertura correspondente: ignora
+
+    def handle_data(self, data):
+        self.atual.filhos.append(data)
+
+
+def parse_html(html):
+    construtor = _Construtor()
+    construtor.feed(html)
+    construtor.close()
+    return construtor.raiz
+
+
+# ================================================================
+# SELETORES CSS
+# ================================================================
+_TOKEN = re.compile(r"""
+    \s*(?P<comb>>)\s*
+  | (?P<espaco>\s+)
+  | (?P<tag>\*|[a-zA-Z][\w-]*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<classe>[\w-]+)
+  | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$~|]?=)\s*(?:"(?P<v1>[^"]*)"|'(?P<v2>[^']*)'|(?P<v3>[^\]\s]+))\s*)?\]
+""", re.VERBOSE)
+
+_cache_seletores = {}
+
+
+def compilar_seletor(seletor):
+    """Converte o seletor em alternativas → cadeias [(combinador, composto), ...].
+
+    Levanta ValueError para sintaxe fora do subconjunto suportado.
+    """
+    if seletor in _cache_seletores:
+        return _cache_seletores[seletor]
+    alternativas = []
+    for parte in seletor.split(","):
+        parte = parte.strip()
+        cadeia, composto, comb, pos = [], None, " ", 0
+        while pos < len(parte):
+            m = _TOKEN.match(parte, pos)
+            if not m or m.end() == pos:
+                raise ValueError(f"seletor não suportado: {seletor!r}")
+            pos = m.end()
+            if m.group("comb") or m.group("espaco"):
+                if composto is not None:
+                    cadeia.append((comb, composto))
+                    composto, comb = None, " "
+                if m.group("comb"):
+                    comb = ">"
+                continue
+            if composto is None:
+                composto = {"tag": None, "id": None, "classes": [], "attrs": []}
+            if m.group("tag"):
+                composto["tag"] = None if m.group("tag") == "*" else m.group("tag").lower()
+            elif m.group("id"):
+                composto["id"] = m.group("id")
+            elif m.group("classe"):
+                composto["classes"].append(m.group("classe"))
+            else:
+                valor = next((v for v in m.group("v1", "v2", "v3") if v is not None), None)
+                composto["attrs"].append((m.group("attr").lower(), m.group("op"), valor))
+        if composto is None:
+            raise ValueError(f"seletor não suportado: {seletor!r}")
+        cadeia.append((comb, composto))
+        alternativas.append(cadeia)
+    _cache_seletores[seletor] = alternativas
+    return alternativas
+
+
+def _casa_composto(el, c):
+    if c["tag"] and el.tag != c["tag"]:
+        return False
+    if c["id"] and el.attrs.get("id") != c["id"]:
+        return False
+    if c["classes"]:
+        classes = el.attrs.get("class", "").split()
+        if not all(cl in classes for cl in c["classes"]):
+            return False
+    for nome, op, valor in c["attrs"]:
+        atual = el.attrs.get(nome)
+        if atual is None:
+            return False
+        if op is None:
+            continue
+        if op == "=" and atual != valor: return False
+        if op == "*=" and (not valor or valor not in atual): return False
+        if op == "^=" and (not valor or not atual.startswith(valor)): return False
+        if op == "$=" and (not valor or not atual.endswith(valor)): return False
+        if op == "~=" and valor not in atual.split(): return False
+        if op == "|=" and not (atual == valor or atual.startswith(valor + "-")): return False
+    return True
+
+
+def _casa(el, cadeia, i):
+    comb, composto = cadeia[i]
+    if not _casa_composto(el, composto):
+        return False
+    if i == 0:
+        return True
+    pai = el.pai
+    if comb == ">":
+        return pai is not None and pai.tag != "#document" and _casa(pai, cadeia, i - 1)
+    while pai is not None and pai.tag != "#document":
+        if _casa(pai, cadeia, i - 1):
+            return True
+        pai = pai.pai
+    return False
+
+
+# ================================================================
+# EXTRAÇÃO — mesmo formato do EXTRATOR_JS do rastreador
+# ================================================================
+def extrair_cards_html(raiz, seletor_card, campos):
+    brutos = []
+    for card in raiz.select(seletor_card):
+        bruto = {'texto': card.texto(), 'html': card.html(), 'campos': {}}
+        for campo, lista in campos.items():
+            bruto['campos'][campo] = []
+            for sel in lista:
+                try:
+                    el = card.select_one(sel)
+                except ValueError:
+                    continue
+                if el is None:
+                    continue
+                valor = el.get("href") if campo == "link" else el.texto()
+                if valor and valor.strip():
+                    bruto['campos'][campo].append([sel, valor.strip()])
+        brutos.append(bruto)
+    return brutos
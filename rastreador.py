@@ -3,8 +3,25 @@ import datetime
 import time
 import random
 import subprocess
+import functools
+import contextlib
+import sys
+import os
+import threading
+import queue
+import signal
+import multiprocessing
+import multiprocessing.managers
+import re
+import hashlib
+import gzip
+import zlib
+import json
+import http.client
+import unicodedata
 import urllib.parse
 from playwright.sync_api import sync_playwright
+from extrator_html import parse_html, extrair_cards_html
 
 # ================================================================
 # CONFIGURAÇÃO — FAGNER PEÇANHA DE OLIVEIRA
@@ -25,6 +42,11 @@ CIDADE_UF       = "São Bernardo do Campo, SP"
 DB_NAME         = "vagas.db"
 LOG_FILE        = "execucao.log"
 MAX_VAGAS_CARGO = 8   # máximo de vagas novas por cargo por plataforma
+USER_AGENT      = (
+    "Mozilla/5.0 (X11; Linux x86_64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/121.0.0.0 Safari/537.36"
+)
 
 # Palavras que marcam a vaga como VIP 🔥
 # Não incluir os próprios cargos buscados (estoque, inventário, PCP, almoxarifado)
@@ -43,12 +65,30 @@ KEYWORDS_VIP = [
     "ABC Paulista", "São Bernardo do Campo",
 ]
 
+# Peso de cada palavra no score VIP (as não listadas valem PESO_PADRAO_VIP).
+# Score = soma dos pesos das palavras distintas encontradas no card.
+PESO_PADRAO_VIP = 1
+PESOS_VIP = {
+    "Scania": 3, "Ford": 3, "Volkswagen": 3, "Mercedes": 3, "MAN": 3,
+    "Toyota": 3, "Honda": 3, "Stellantis": 3, "Bosch": 3,
+    "SAP": 2, "WMS": 2, "S&OP": 2, "Supply Chain": 2,
+}
+SCORE_MIN_VIP = 1   # score a partir do qual a vaga é marcada como VIP
+
 # ================================================================
 # BANCO DE DADOS
 # ================================================================
-def init_db():
+def abrir_db():
+    """Conexão única para a varredura inteira (WAL: ver_vagas.py pode ler em paralelo)."""
     conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")   # WAL + NORMAL: sem fsync a cada commit
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-16000")    # ~16 MB
+    return conn
+
+def _migracao_1(cursor):
+    """Esquema até aqui (bancos antigos chegam com user_version 0 em qualquer estágio)."""
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS vagas (
             id            TEXT PRIMARY KEY,
@@ -58,52 +98,566 @@ def init_db():
             link          TEXT,
             plataforma    TEXT,
             data_encontrada DATETIME,
-            match_vip     BOOLEAN DEFAULT 0
+            match_vip     BOOLEAN DEFAULT 0,
+            score_vip     INTEGER DEFAULT 0,
+            keywords_vip  TEXT,
+            cluster_id    TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS seletor_stats (
+            plataforma      TEXT,
+            campo           TEXT,
+            seletor         TEXT,
+            acertos         INTEGER DEFAULT 0,
+            tentativas      INTEGER DEFAULT 0,
+            ultima_execucao INTEGER,
+            PRIMARY KEY (plataforma, campo, seletor)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS seletor_execucoes (
+            plataforma TEXT PRIMARY KEY,
+            execucoes  INTEGER DEFAULT 0
+        )
+    ''')
+    # Padrões de popup que de fato apareceram — os que nunca aparecem podem sair de POPUPS
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS popups_vistos (
+            plataforma TEXT,
+            padrao     TEXT,
+            vezes      INTEGER DEFAULT 0,
+            ultima_vez DATETIME,
+            PRIMARY KEY (plataforma, padrao)
+        )
+    ''')
+    # Uma linha por (plataforma, cargo): marca d'água da paginação
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS buscas (
+            plataforma       TEXT,
+            cargo            TEXT,
+            ultima_varredura DATETIME,
+            PRIMARY KEY (plataforma, cargo)
+        )
+    ''')
+    # Hash dos hrefs dos cards por URL de busca (páginas inalteradas são puladas)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS impressoes (
+            url        TEXT PRIMARY KEY,
+            impressao  TEXT,
+            atualizada DATETIME
+        )
+    ''')
+    # Cronometragem: uma linha por varredura e uma por etapa medida
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS runs (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            inicio      DATETIME,
+            fim         DATETIME,
+            duracao_s   REAL,
+            plataformas INTEGER,
+            cargos      INTEGER,
+            novas       INTEGER,
+            vip         INTEGER
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS run_steps (
+            run_id     INTEGER REFERENCES runs(id),
+            plataforma TEXT,
+            cargo      TEXT,
+            fase       TEXT,
+            inicio     DATETIME,
+            duracao_ms REAL
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_run_steps_run ON run_steps (run_id, plataforma, fase)")
+    # Duplicadas entre plataformas: bandas LSH → cluster e os tokens do cluster
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dedup_bandas (
+            banda      TEXT,
+            cluster_id TEXT,
+            PRIMARY KEY (banda, cluster_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dedup_clusters (
+            cluster_id TEXT PRIMARY KEY,
+            tokens     TEXT
+        )
+    ''')
+    # Bancos anteriores às colunas novas da tabela vagas
+    existentes = {linha[1] for linha in cursor.execute("PRAGMA table_info(vagas)")}
+    for coluna in ("plataforma TEXT", "score_vip INTEGER DEFAULT 0", "keywords_vip TEXT",
+                   "cluster_id TEXT"):
+        if coluna.split()[0] not in existentes:
+            cursor.execute(f"ALTER TABLE vagas ADD COLUMN {coluna}")
+
+def _migracao_2(cursor):
+    """Índices para as consultas do ver_vagas.py e da deduplicação."""
+    # Lista principal: só a primeira vaga de cada cluster, VIP primeiro e mais recentes
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_vagas_canonicas
+        ON vagas (match_vip DESC, data_encontrada DESC) WHERE cluster_id = id
+    ''')
+    # Fontes de um cluster e backfill (cluster_id IS NULL)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_cluster ON vagas (cluster_id)")
+    # Filtro por plataforma e por intervalo de datas
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_plataforma_data ON vagas (plataforma, data_encontrada)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_vagas_data ON vagas (data_encontrada)")
+
+def _migracao_3(cursor):
+    """Texto do card e busca textual (FTS5) sincronizada por triggers."""
+    existentes = {linha[1] for linha in cursor.execute("PRAGMA table_info(vagas)")}
+    if "texto" not in existentes:
+        cursor.execute("ALTER TABLE vagas ADD COLUMN texto TEXT")
+    # Conteúdo externo: o índice aponta para o rowid de vagas, sem duplicar o texto
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS vagas_fts USING fts5(
+            titulo, empresa, texto,
+            content='vagas', content_rowid='rowid',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
+    # (execute um a um: executescript faria COMMIT no meio da migração)
+    for trigger in ('''
+        CREATE TRIGGER IF NOT EXISTS vagas_fts_ai AFTER INSERT ON vagas BEGIN
+            INSERT INTO vagas_fts (rowid, titulo, empresa, texto)
+            VALUES (new.rowid, new.titulo, new.empresa, new.texto);
+        END
+    ''', '''
+        CREATE TRIGGER IF NOT EXISTS vagas_fts_ad AFTER DELETE ON vagas BEGIN
+            INSERT INTO vagas_fts (vagas_fts, rowid, titulo, empresa, texto)
+            VALUES ('delete', old.rowid, old.titulo, old.empresa, old.texto);
+        END
+    ''', '''
+        CREATE TRIGGER IF NOT EXISTS vagas_fts_au AFTER UPDATE OF titulo, empresa, texto ON vagas BEGIN
+            INSERT INTO vagas_fts (vagas_fts, rowid, titulo, empresa, texto)
+            VALUES ('delete', old.rowid, old.titulo, old.empresa, old.texto);
+            INSERT INTO vagas_fts (rowid, titulo, empresa, texto)
+            VALUES (new.rowid, new.titulo, new.empresa, new.texto);
+        END
+    '''):
+        cursor.execute(trigger)
+    # Vagas antigas entram no índice (só título/empresa: o texto não era guardado)
+    cursor.execute("INSERT INTO vagas_fts (vagas_fts) VALUES ('rebuild')")
+
+def _migracao_4(cursor):
+    """Arquivo comprimido da captura bruta de cada vaga (HTML do card ou JSON da API)."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS capturas (
+            vaga_id   TEXT PRIMARY KEY REFERENCES vagas(id),
+            formato   TEXT,
+            conteudo  BLOB,
+            capturada DATETIME
         )
     ''')
-    # Migração: adiciona coluna plataforma se já existia tabela sem ela
-    try:
-        cursor.execute("ALTER TABLE vagas ADD COLUMN plataforma TEXT")
-    except sqlite3.OperationalError:
-        pass  # coluna já existe
-    conn.commit()
-    conn.close()
 
-def vaga_existe(id_vaga):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute('SELECT 1 FROM vagas WHERE id = ?', (id_vaga,))
-    existe = cursor.fetchone() is not None
-    conn.close()
-    return existe
+def _migracao_5(cursor):
+    """Índice da paginação por (data_encontrada, id) do painel (ver_vagas.py --serve)."""
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_vagas_canonicas_recentes
+        ON vagas (data_encontrada DESC, id DESC) WHERE cluster_id = id
+    ''')
 
-def salvar_vaga(vaga):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    try:
-        cursor.execute('''
-            INSERT INTO vagas (id, titulo, empresa, local, link, plataforma, data_encontrada, match_vip)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            vaga['id'], vaga['titulo'], vaga['empresa'], vaga['local'],
-            vaga['link'], vaga.get('plataforma', ''), datetime.datetime.now(), vaga['match_vip']
-        ))
-        conn.commit()
-        return True
-    except sqlite3.IntegrityError:
+def _migracao_6(cursor):
+    """Deduplicação só entre plataformas diferentes e dentro de JANELA_DEDUP_DIAS."""
+    existentes = {linha[1] for linha in cursor.execute("PRAGMA table_info(dedup_clusters)")}
+    for coluna in ("plataformas TEXT", "visto_em DATETIME"):
+        if coluna.split()[0] not in existentes:
+            cursor.execute(f"ALTER TABLE dedup_clusters ADD COLUMN {coluna}")
+    # Os clusters antigos juntavam vagas distintas da mesma empresa: o
+    # agrupamento é refeito do zero por agrupar_existentes, logo após as migrações
+    cursor.execute("DELETE FROM dedup_bandas")
+    cursor.execute("DELETE FROM dedup_clusters")
+    cursor.execute("UPDATE vagas SET cluster_id = NULL")
+
+def _migracao_7(cursor):
+    """VIP do cluster em colunas próprias: cada linha mantém o seu score_vip."""
+    existentes = {linha[1] for linha in cursor.execute("PRAGMA table_info(vagas)")}
+    for coluna in ("vip_cluster BOOLEAN DEFAULT 0", "score_cluster INTEGER DEFAULT 0"):
+        if coluna.split()[0] not in existentes:
+            cursor.execute(f"ALTER TABLE vagas ADD COLUMN {coluna}")
+    # A lista ordena pelo VIP do cluster; o índice antigo (match_vip) fica sem uso
+    cursor.execute("DROP INDEX IF EXISTS idx_vagas_canonicas")
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_vagas_canonicas_vip
+        ON vagas (vip_cluster DESC, data_encontrada DESC) WHERE cluster_id = id
+    ''')
+    cursor.execute(SQL_CONSOLIDAR_CLUSTERS)
+
+def _migracao_8(cursor):
+    """Marcador de alterações em vagas (ETag do painel): avança em INSERT, UPDATE e DELETE."""
+    # Uma linha só; --rescore e o VIP dos clusters mudam vagas sem inserir nada
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS alteracoes (
+            id       INTEGER PRIMARY KEY CHECK (id = 1),
+            versao   INTEGER NOT NULL,
+            alterada DATETIME
+        )
+    ''')
+    cursor.execute(
+        "INSERT OR IGNORE INTO alteracoes (id, versao, alterada) VALUES (1, 0, datetime('now', 'localtime'))")
+    for evento in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS vagas_alteracoes_{evento.lower()} AFTER {evento} ON vagas BEGIN
+                UPDATE alteracoes SET versao = versao + 1, alterada = datetime('now', 'localtime')
+                WHERE id = 1;
+            END
+        ''')
+
+# Migrações em ordem: a posição + 1 é a versão gravada em PRAGMA user_version.
+# Nunca altere uma migração publicada — acrescente outra no fim da lista.
+MIGRACOES = [_migracao_1, _migracao_2, _migracao_3, _migracao_4, _migracao_5, _migracao_6,
+             _migracao_7, _migracao_8]
+
+def init_db(conn):
+    versao = conn.execute("PRAGMA user_version").fetchone()[0]
+    for numero, migracao in enumerate(MIGRACOES[versao:], start=versao + 1):
+        # DDL e user_version na mesma transação: ou a migração entra inteira ou nada
+        conn.execute("BEGIN")
+        try:
+            migracao(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {numero}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        log(f">>> Banco migrado para a versão {numero}: {migracao.__doc__.splitlines()[0]}")
+    agrupar_existentes(conn)
+
+def carregar_ids(conn):
+    """IDs já gravados — checados em memória em vez de um SELECT por vaga."""
+    return {row[0] for row in conn.execute("SELECT id FROM vagas")}
+
+def carregar_ultimas_varreduras(conn):
+    return {
+        (plataforma, cargo): datetime.datetime.fromisoformat(ultima)
+        for plataforma, cargo, ultima in conn.execute(
+            "SELECT plataforma, cargo, ultima_varredura FROM buscas WHERE ultima_varredura IS NOT NULL")
+    }
+
+def registrar_varredura(conn, plataforma, cargo, quando):
+    with conn:
+        conn.execute('''
+            INSERT INTO buscas (plataforma, cargo, ultima_varredura) VALUES (?, ?, ?)
+            ON CONFLICT(plataforma, cargo) DO UPDATE SET ultima_varredura = excluded.ultima_varredura
+        ''', (plataforma, cargo, quando.isoformat(sep=" ")))
+
+def carregar_impressoes(conn):
+    return dict(conn.execute("SELECT url, impressao FROM impressoes"))
+
+def salvar_impressoes(conn, impressoes):
+    if not impressoes:
+        return
+    agora = datetime.datetime.now()
+    with conn:
+        conn.executemany('''
+            INSERT INTO impressoes (url, impressao, atualizada) VALUES (?, ?, ?)
+            ON CONFLICT(url) DO UPDATE SET impressao = excluded.impressao,
+                                           atualizada = excluded.atualizada
+        ''', [(url, impressao, agora) for url, impressao in impressoes])
+
+def salvar_popups(conn, plataforma, popups):
+    if not popups:
+        return
+    agora = datetime.datetime.now()
+    with conn:
+        conn.executemany('''
+            INSERT INTO popups_vistos (plataforma, padrao, vezes, ultima_vez) VALUES (?, ?, ?, ?)
+            ON CONFLICT(plataforma, padrao) DO UPDATE SET vezes = vezes + excluded.vezes,
+                                                          ultima_vez = excluded.ultima_vez
+        ''', [(plataforma, padrao, vezes, agora) for padrao, vezes in popups.items()])
+
+def iniciar_run(conn, inicio, plataformas=None):
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO runs (inicio, plataformas, cargos) VALUES (?, ?, ?)",
+            (inicio.isoformat(sep=" "), plataformas or len(PLATAFORMAS), len(CARGOS))
+        )
+    return cursor.lastrowid
+
+def finalizar_run(conn, run_id, inicio, novas, vip):
+    fim = datetime.datetime.now()
+    with conn:
+        conn.execute(
+            "UPDATE runs SET fim = ?, duracao_s = ?, novas = ?, vip = ? WHERE id = ?",
+            (fim.isoformat(sep=" "), (fim - inicio).total_seconds(), novas, vip, run_id)
+        )
+
+def salvar_etapas(conn, run_id, etapas):
+    if not etapas:
+        return
+    with conn:
+        conn.executemany('''
+            INSERT INTO run_steps (run_id, plataforma, cargo, fase, inicio, duracao_ms)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', [(run_id, *e) for e in etapas])
+
+NIVEL_COMPRESSAO = 6   # zlib, para as capturas brutas
+
+def salvar_lote(conn, vagas, ids_conhecidos, limite=None):
+    """Grava as vagas ainda desconhecidas numa única transação.
+
+    Retorna a lista das que eram novas (no máximo `limite`) e atualiza
+    `ids_conhecidos`.
+    """
+    novas = []
+    for vaga in vagas:
+        if limite is not None and len(novas) >= limite:
+            break
+        if vaga['id'] in ids_conhecidos:
+            continue
+        ids_conhecidos.add(vaga['id'])
+        novas.append(vaga)
+    if not novas:
+        return []
+
+    agora = datetime.datetime.now()
+    with conn:
+        for v in novas:
+            v['cluster_id'], v['repetida'] = agrupar_vaga(
+                conn, v['id'], v['titulo'], v['empresa'], v.get('plataforma', ''), agora)
+        conn.executemany('''
+            INSERT INTO vagas (id, titulo, empresa, local, link, plataforma, data_encontrada,
+                               match_vip, score_vip, keywords_vip, cluster_id, texto,
+                               vip_cluster, score_cluster)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO NOTHING
+        ''', [(
+            v['id'], v['titulo'], v['empresa'], v['local'],
+            v['link'], v.get('plataforma', ''), agora, v['match_vip'],
+            v.get('score_vip', 0), ", ".join(v.get('keywords_vip', [])), v['cluster_id'],
+            # vip_cluster/score_cluster só valem na linha canônica (elevar_cluster)
+            v.get('texto'), *((0, 0) if v['repetida'] else (v['match_vip'], v.get('score_vip', 0)))
+        ) for v in novas])
+        # Captura bruta comprimida: permite reclassificar (--rescore) sem refazer a coleta
+        conn.executemany('''
+            INSERT INTO capturas (vaga_id, formato, conteudo, capturada) VALUES (?, ?, ?, ?)
+            ON CONFLICT(vaga_id) DO NOTHING
+        ''', [
+            (v['id'], v['captura'][0], zlib.compress(v['captura'][1].encode("utf-8"), NIVEL_COMPRESSAO), agora)
+            for v in novas if v.get('captura') and v['captura'][1]
+        ])
+        # A linha canônica guarda o VIP do cluster (o maior entre as fontes) em
+        # vip_cluster/score_cluster — é por eles que a lista ordena e exibe
+        for v in novas:
+            v['promoveu_vip'] = False
+            if v['repetida']:
+                v['promoveu_vip'] = elevar_cluster(conn, v['cluster_id'], v)
+    return novas
+
+def elevar_cluster(conn, cluster_id, vaga):
+    """Soma a vaga repetida ao VIP do cluster. True se foi ela que tornou o cluster VIP."""
+    canonica = conn.execute("SELECT vip_cluster FROM vagas WHERE id = ?", (cluster_id,)).fetchone()
+    if canonica is None:
         return False
-    finally:
-        conn.close()
+    conn.execute(
+        "UPDATE vagas SET vip_cluster = MAX(vip_cluster, ?), score_cluster = MAX(score_cluster, ?) WHERE id = ?",
+        (vaga['match_vip'], vaga.get('score_vip', 0), cluster_id))
+    return bool(vaga['match_vip']) and not canonica[0]
+
+# VIP do cluster = o maior entre as fontes, a partir do score próprio de cada linha
+SQL_CONSOLIDAR_CLUSTERS = '''
+    UPDATE vagas SET (vip_cluster, score_cluster) = (
+        SELECT MAX(d.match_vip), MAX(d.score_vip) FROM vagas d WHERE d.cluster_id = vagas.id)
+    WHERE cluster_id = id
+'''
+
+def consolidar_clusters(conn):
+    """Recalcula vip_cluster/score_cluster das linhas canônicas (após --rescore ou reagrupamento)."""
+    with conn:
+        conn.execute(SQL_CONSOLIDAR_CLUSTERS)
+
+# ================================================================
+# DUPLICADAS ENTRE PLATAFORMAS (MinHash + LSH)
+# montar_id inclui a plataforma, então a mesma vaga publicada na Gupy, no
+# Indeed e na InfoJobs vira três linhas. Cada vaga nova é comparada só com
+# os clusters que compartilham alguma banda da sua assinatura MinHash
+# (consulta indexada), e entra no cluster se a similaridade de Jaccard dos
+# tokens (título + empresa) passar de LIMIAR_DEDUP. Só agrupa fontes de
+# plataformas diferentes, vistas há menos de JANELA_DEDUP_DIAS, com o mesmo
+# nível (júnior/pleno/sênior...); títulos curtos precisam ser idênticos —
+# "Analista de Logística" e "Analista de Logística Sr" são duas vagas.
+# ================================================================
+LIMIAR_DEDUP    = 0.75
+JANELA_DEDUP_DIAS = 30   # depois disso, a mesma vaga republicada conta como nova
+TITULO_CURTO    = 4      # tokens de título; até aqui uma palavra a mais já é outra vaga
+BANDAS_LSH      = 8
+LINHAS_POR_BANDA = 4     # 8 × 4 = 32 funções de hash
+STOPWORDS_DEDUP = {
+    "a", "o", "as", "os", "de", "da", "do", "das", "dos", "e", "em", "na", "no",
+    "para", "com", "por", "vaga", "vagas", "urgente", "oportunidade", "m", "f",
+    "ltda", "sa", "s", "eireli", "me", "grupo", "brasil",
+}
+SINONIMOS_DEDUP = {"jr": "junior", "pl": "pleno", "sr": "senior", "i": "junior",
+                   "ii": "pleno", "iii": "senior", "coord": "coordenador", "anl": "analista"}
+# Tokens de nível: precisam coincidir (depois de SINONIMOS_DEDUP)
+NIVEIS_DEDUP = {"junior", "pleno", "senior", "trainee", "estagio", "estagiario",
+                "aprendiz", "especialista", "master", "lider"}
+# Sem empresa identificável não dá para afirmar que é a mesma vaga
+EMPRESAS_GENERICAS = {"", "confidencial", "empresa confidencial", "nao informada"}
+
+# Coeficientes fixos: as bandas gravadas no banco precisam valer entre execuções
+_PRIMO_MINHASH = (1 << 61) - 1
+_sorteio       = random.Random(2024)
+_COEF_MINHASH  = [
+    (_sorteio.randrange(1, _PRIMO_MINHASH), _sorteio.randrange(0, _PRIMO_MINHASH))
+    for _ in range(BANDAS_LSH * LINHAS_POR_BANDA)
+]
+
+def _tokens(texto):
+    palavras = re.findall(r"[a-z0-9&+#]+", normalizar(texto or ""))
+    return {SINONIMOS_DEDUP.get(p, p) for p in palavras if p not in STOPWORDS_DEDUP}
+
+def tokens_dedup(titulo, empresa):
+    """Conjunto de tokens de título e empresa (prefixo '@'), ou None se a empresa é genérica."""
+    if normalizar((empresa or "").strip()) in EMPRESAS_GENERICAS:
+        return None
+    empresa_tokens = _tokens(empresa)
+    titulo_tokens  = _tokens(titulo)
+    if not empresa_tokens or not titulo_tokens:
+        return None
+    return titulo_tokens | {"@" + t for t in empresa_tokens}
+
+def bandas_minhash(tokens):
+    hashes = [int.from_bytes(hashlib.blake2b(t.encode(), digest_size=8).digest(), "big")
+              for t in tokens]
+    assinatura = [min((a * h + b) % _PRIMO_MINHASH for h in hashes) for a, b in _COEF_MINHASH]
+    return [
+        f"{i}:" + hashlib.blake2b(
+            repr(assinatura[i * LINHAS_POR_BANDA:(i + 1) * LINHAS_POR_BANDA]).encode(),
+            digest_size=8).hexdigest()
+        for i in range(BANDAS_LSH)
+    ]
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+def similaridade_dedup(tokens, tokens_cluster):
+    """Jaccard dos tokens, ou 0 quando nível ou título curto mostram que são vagas distintas."""
+    titulo         = {t for t in tokens if not t.startswith("@")}
+    titulo_cluster = {t for t in tokens_cluster if not t.startswith("@")}
+    if titulo & NIVEIS_DEDUP != titulo_cluster & NIVEIS_DEDUP:
+        return 0.0
+    if min(len(titulo), len(titulo_cluster)) <= TITULO_CURTO and titulo != titulo_cluster:
+        return 0.0
+    return jaccard(tokens, tokens_cluster)
+
+def agrupar_vaga(conn, vaga_id, titulo, empresa, plataforma, quando):
+    """Devolve (cluster_id, repetida). Uma vaga sem par vira o próprio cluster."""
+    tokens = tokens_dedup(titulo, empresa)
+    if tokens is None:
+        return vaga_id, False
+    bandas = bandas_minhash(tokens)
+    marcas = ",".join("?" * len(bandas))
+    desde  = (quando - datetime.timedelta(days=JANELA_DEDUP_DIAS)).isoformat(sep=" ")
+    melhor, melhor_sim = None, LIMIAR_DEDUP
+    for cluster_id, tokens_cluster, plataformas in conn.execute(f'''
+        SELECT c.cluster_id, c.tokens, c.plataformas FROM dedup_clusters c
+        WHERE c.cluster_id IN (SELECT cluster_id FROM dedup_bandas WHERE banda IN ({marcas}))
+          AND c.visto_em >= ?
+    ''', [*bandas, desde]):
+        # Duas vagas parecidas na mesma plataforma são duas publicações distintas
+        if plataforma in plataformas.split(","):
+            continue
+        sim = similaridade_dedup(tokens, set(tokens_cluster.split()))
+        if sim >= melhor_sim:
+            melhor, melhor_sim = cluster_id, sim
+    cluster_id = melhor or vaga_id
+    visto_em   = quando.isoformat(sep=" ")
+    if melhor is None:
+        conn.execute('''
+            INSERT OR IGNORE INTO dedup_clusters (cluster_id, tokens, plataformas, visto_em)
+            VALUES (?, ?, ?, ?)
+        ''', (cluster_id, " ".join(sorted(tokens)), plataforma, visto_em))
+    else:
+        conn.execute(
+            "UPDATE dedup_clusters SET plataformas = plataformas || ',' || ?, visto_em = ? WHERE cluster_id = ?",
+            (plataforma, visto_em, cluster_id))
+    # As bandas da variante também entram: aumentam a chance de achar a próxima
+    conn.executemany("INSERT OR IGNORE INTO dedup_bandas (banda, cluster_id) VALUES (?, ?)",
+                     [(banda, cluster_id) for banda in bandas])
+    return cluster_id, melhor is not None
+
+def agrupar_existentes(conn):
+    """Atribui cluster_id às vagas gravadas antes da deduplicação (uma vez só)."""
+    pendentes = conn.execute('''
+        SELECT id, titulo, empresa, plataforma, data_encontrada FROM vagas
+        WHERE cluster_id IS NULL ORDER BY data_encontrada
+    ''').fetchall()
+    if not pendentes:
+        return
+    log(f">>> Agrupando {len(pendentes)} vagas já gravadas (duplicadas entre plataformas)...")
+    agora = datetime.datetime.now()
+    with conn:
+        conn.executemany("UPDATE vagas SET cluster_id = ? WHERE id = ?", [
+            (agrupar_vaga(conn, vaga_id, titulo, empresa, plataforma or "",
+                          datetime.datetime.fromisoformat(data) if data else agora)[0], vaga_id)
+            for vaga_id, titulo, empresa, plataforma, data in pendentes
+        ])
+    consolidar_clusters(conn)
 
 # ================================================================
 # UTILITÁRIOS
 # ================================================================
+_log_lock = threading.Lock()  # plataformas rodam em paralelo e compartilham o log
+
 def log(mensagem):
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     linha = f"[{timestamp}] {mensagem}"
-    print(linha)
-    with open(LOG_FILE, "a") as f:
-        f.write(linha + "\n")
+    with _log_lock:
+        print(linha)
+        with open(LOG_FILE, "a") as f:
+            f.write(linha + "\n")
+
+# ── Cronometragem por fase ──
+# Cada etapa (espera, goto, networkidle, popups, seletor_card, extracao,
+# http, db...) vira uma linha em run_steps, com plataforma e cargo.
+_etapas      = []                 # [(plataforma, cargo, fase, inicio, duracao_ms)]
+_etapas_lock = threading.Lock()
+_contexto    = threading.local()  # plataforma/cargo em andamento neste worker
+
+def definir_contexto(plataforma, cargo=None):
+    _contexto.plataforma = plataforma
+    _contexto.cargo      = cargo
+
+@contextlib.contextmanager
+def etapa(fase, plataforma=None, cargo=None):
+    plataforma = plataforma or getattr(_contexto, 'plataforma', None)
+    cargo      = cargo or getattr(_contexto, 'cargo', None)
+    inicio     = datetime.datetime.now()
+    t0         = time.perf_counter()
+    try:
+        yield
+    finally:
+        duracao_ms = (time.perf_counter() - t0) * 1000
+        with _etapas_lock:
+            _etapas.append((plataforma, cargo, fase, inicio.isoformat(sep=" "), duracao_ms))
+
+def cronometrado(fase):
+    """Decorador: a função inteira conta como uma etapa."""
+    def decorador(fn):
+        @functools.wraps(fn)
+        def envolvida(*args, **kwargs):
+            with etapa(fase):
+                return fn(*args, **kwargs)
+        return envolvida
+    return decorador
+
+def coletar_etapas(plataforma):
+    with _etapas_lock:
+        minhas = [e for e in _etapas if e[0] == plataforma]
+        _etapas[:] = [e for e in _etapas if e[0] != plataforma]
+    return minhas
+
+def aguardar_networkidle(page, timeout):
+    """networkidle que não trava a busca: timeout é aceitável, só é medido."""
+    with etapa("networkidle"):
+        try:
+            page.wait_for_load_state("networkidle", timeout=timeout)
+        except Exception:
+            pass
 
 def notificar(qtd_novas, qtd_vip):
     if qtd_novas == 0:
@@ -116,31 +670,132 @@ def notificar(qtd_novas, qtd_vip):
     except Exception:
         pass
 
+# ── Popups de cookies/consentimento ──
+# Todos os padrões são testados numa única chamada dentro da página: o
+# script clica no primeiro botão visível e devolve o nome do padrão.
+# Com a sessão restaurada (ESTADO_SESSAO) o site já não mostra o banner e
+# a chamada não clica em nada.
+POPUPS = [
+    # (nome, seletor CSS, regex do texto do botão)
+    ("onetrust",      'button[id*="onetrust-accept"]', None),
+    ("id_accept",     'button[id*="accept"]',          None),
+    ("aceitar_tudo",  "button",                        r"aceitar tudo"),
+    ("aceitar",       "button",                        r"aceitar"),
+    ("concordar",     "button",                        r"concordar"),
+    ("entendi",       "button",                        r"entendi"),
+    ("ok",            "button",                        r"^\s*ok\s*$"),
+    ("aria_fechar",   '[aria-label="fechar" i]',       None),
+]
+
+FECHAR_POPUPS_JS = r"""
+(padroes) => {
+    const visivel = (el) => {
+        const r = el.getBoundingClientRect();
+        if (!r.width || !r.height) return false;
+        const st = getComputedStyle(el);
+        return st.visibility !== 'hidden' && st.display !== 'none' && st.opacity !== '0';
+    };
+    for (const [nome, css, texto] of padroes) {
+        const re = texto ? new RegExp(texto, 'i') : null;
+        for (const el of document.querySelectorAll(css)) {
+            if (re && !re.test(el.innerText || '')) continue;
+            if (visivel(el)) { el.click(); return nome; }
+        }
+    }
+    return null;
+}
+"""
+
+_popups      = {}   # { (plataforma, padrão): vezes } — padrões que de fato apareceram
+_popups_lock = threading.Lock()
+
+def registrar_popup(plataforma, padrao):
+    with _popups_lock:
+        _popups[(plataforma, padrao)] = _popups.get((plataforma, padrao), 0) + 1
+
+def coletar_popups(plataforma):
+    """Retira (e devolve) os popups vistos por uma plataforma: { padrão: vezes }."""
+    with _popups_lock:
+        chaves = [k for k in _popups if k[0] == plataforma]
+        return {k[1]: _popups.pop(k) for k in chaves}
+
+@cronometrado("popups")
 def fechar_popups(page):
-    """Tenta fechar popups de cookies/consentimento comuns."""
-    seletores = [
-        'button[id*="onetrust-accept"]',
-        'button[id*="accept"]',
-        'button:has-text("Aceitar tudo")',
-        'button:has-text("Aceitar")',
-        'button:has-text("Concordar")',
-        'button:has-text("Entendi")',
-        'button:has-text("OK")',
-        '[aria-label="fechar"]',
-        '[aria-label="Fechar"]',
-    ]
-    for sel in seletores:
-        try:
-            btn = page.locator(sel).first
-            if btn.is_visible(timeout=1500):
-                btn.click()
-                time.sleep(0.8)
-                return
-        except Exception:
-            pass
+    """Fecha o popup de cookies/consentimento visível, se houver, num único round-trip."""
+    try:
+        padrao = page.evaluate(FECHAR_POPUPS_JS, [list(p) for p in POPUPS])
+    except Exception:
+        return
+    if padrao:
+        registrar_popup(getattr(_contexto, 'plataforma', None), padrao)
+
+def sem_acentos(texto):
+    """'São Bernardo' → 'Sao Bernardo' (mantém maiúsculas)."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+def normalizar(texto):
+    """Minúsculas e sem acentos: 'Automobilística' → 'automobilistica'."""
+    return sem_acentos(texto.casefold())
+
+def _regex_trie(palavras):
+    """Alternância em forma de trie — sem backtracking entre palavras com prefixo comum."""
+    trie = {}
+    for palavra in palavras:
+        no = trie
+        for c in palavra:
+            no = no.setdefault(c, {})
+        no[""] = True
+
+    def montar(no):
+        fim = no.pop("", False)
+        ramos = [re.escape(c) + montar(filho) for c, filho in sorted(no.items())]
+        if not ramos:
+            return ""
+        corpo = ramos[0] if len(ramos) == 1 else "(?:" + "|".join(ramos) + ")"
+        if fim:
+            corpo = f"(?:{corpo})?"
+        return corpo
+
+    return montar(trie)
+
+def eh_sigla(keyword):
+    """'MAN', 'SAP', '3M', 'S&OP' — só maiúsculas (e dígitos/símbolos)."""
+    return keyword == keyword.upper() and any(c.isalpha() for c in keyword)
+
+def _compilar_trie(canonicas, letras):
+    if not canonicas:
+        return re.compile(r"(?!)")   # lista vazia: nunca casa
+    return re.compile(rf"(?<![0-9{letras}])(" + _regex_trie(canonicas) + rf")(?![0-9{letras}])")
+
+def compilar_keywords(keywords):
+    """Compila a lista uma única vez: regex sem acento, com limite de palavra.
+
+    Siglas vão para uma segunda regex que respeita maiúsculas: "man power"
+    ou "sap" dentro de uma frase não são a MAN nem o SAP.
+    Retorna ((regex, canônicas) das palavras, (regex, canônicas) das siglas).
+    """
+    palavras = {normalizar(kw): kw for kw in keywords if not eh_sigla(kw)}
+    siglas   = {sem_acentos(kw): kw for kw in keywords if eh_sigla(kw)}
+    return (_compilar_trie(palavras, "a-z"), palavras), (_compilar_trie(siglas, "A-Za-z"), siglas)
+
+_VIP_PALAVRAS, _VIP_SIGLAS = compilar_keywords(KEYWORDS_VIP)
+
+def avaliar_vip(texto):
+    """Retorna (keywords encontradas, score ponderado) — uma passada por regex."""
+    achados = []
+    for (regex, canonicas), alvo in ((_VIP_PALAVRAS, normalizar(texto)),
+                                     (_VIP_SIGLAS, sem_acentos(texto))):
+        achados += [(m.start(), canonicas[m.group(1)]) for m in regex.finditer(alvo)]
+    encontradas = []
+    for _, kw in sorted(achados):
+        if kw not in encontradas:
+            encontradas.append(kw)
+    score = sum(PESOS_VIP.get(kw, PESO_PADRAO_VIP) for kw in encontradas)
+    return encontradas, score
 
 def checar_vip(texto):
-    return any(kw.lower() in texto.lower() for kw in KEYWORDS_VIP)
+    return avaliar_vip(texto)[1] >= SCORE_MIN_VIP
 
 def montar_id(titulo, empresa, plataforma):
     raw = f"{plataforma}-{titulo}-{empresa}".lower()
@@ -155,12 +810,918 @@ def salvar_debug_html(page, nome_arquivo="debug_pagina.html"):
         pass
 
 
+# ================================================================
+# RITMO POR HOST (token bucket adaptativo)
+# Substitui as pausas fixas: cada host tem um intervalo mínimo entre
+# requisições, com jitter, que dobra quando o site reage (429/403,
+# captcha, lentidão) e encolhe aos poucos quando responde limpo.
+# ================================================================
+# Intervalo entre requisições ao mesmo host, em segundos
+RITMO_PADRAO = {'inicial': 6.0, 'min': 3.0, 'max': 90.0, 'rajada': 1}
+RITMO = {
+    "Indeed":    {'inicial': 5.0, 'min': 2.5},
+    "Vagas.com": {'inicial': 4.0, 'min': 2.0},
+    # Catho tem anti-bot pesado — começa devagar e nunca acelera muito
+    "Catho":     {'inicial': 10.0, 'min': 6.0, 'max': 180.0},
+}
+JITTER_RITMO     = 0.3    # ±30% em cada espera
+RESPOSTA_LENTA_S = 12.0   # navegação acima disso conta como sinal de carga
+FATOR_RECUO      = 2.0    # 429/403/captcha
+FATOR_LENTIDAO   = 1.5
+FATOR_ACELERA    = 0.85   # resposta limpa e rápida
+
+MARCADORES_BLOQUEIO = [
+    'captcha', 'verifique se você é humano', 'verify you are human',
+    'just a moment', 'access denied', 'acesso negado',
+    'unusual traffic', 'tráfego incomum', 'attention required',
+]
+MARCADORES_BLOQUEIO_JS = """
+(marcadores) => {
+    const texto = (document.title + ' ' +
+                   (document.body ? document.body.innerText.slice(0, 3000) : '')).toLowerCase();
+    return marcadores.some(m => texto.includes(m)) ||
+           !!document.querySelector('iframe[src*="captcha"], #challenge-form, [class*="cf-challenge"]');
+}
+"""
+
+
+class Limitador:
+    """Um balde de tokens por host; seguro para uso pelos workers em paralelo."""
+
+    def __init__(self):
+        self._hosts = {}
+        self._lock  = threading.Lock()
+
+    def _estado(self, host, plataforma):
+        if host not in self._hosts:
+            cfg = {**RITMO_PADRAO, **RITMO.get(plataforma, {})}
+            self._hosts[host] = {
+                **cfg, 'intervalo': cfg['inicial'], 'tokens': float(cfg['rajada']),
+                'ultimo': time.monotonic(), 'pausa_ate': 0.0,
+                'requisicoes': 0, 'recuos': 0, 'espera_total': 0.0,
+                'plataforma': plataforma,
+            }
+        return self._hosts[host]
+
+    def reservar(self, host, plataforma=None):
+        """Consome um token do host e devolve quantos segundos esperar por ele (com jitter)."""
+        with self._lock:
+            e = self._estado(host, plataforma)
+            agora = time.monotonic()
+            e['tokens'] = min(e['rajada'], e['tokens'] + (agora - e['ultimo']) / e['intervalo'])
+            e['ultimo'] = agora
+            falta = max(0.0, (1 - e['tokens']) * e['intervalo'], e['pausa_ate'] - agora)
+            espera = falta * random.uniform(1 - JITTER_RITMO, 1 + JITTER_RITMO) if falta else 0.0
+            e['tokens'] -= 1
+            e['requisicoes'] += 1
+            e['espera_total'] += espera
+        return espera
+
+    def aguardar(self, host, plataforma=None):
+        """Bloqueia até haver token para o host."""
+        espera = self.reservar(host, plataforma)
+        if espera:
+            time.sleep(espera)
+
+    def registrar(self, host, status=None, duracao=None, bloqueado=False, retry_after=None):
+        """Ajusta o ritmo do host conforme a resposta."""
+        with self._lock:
+            e = self._estado(host, None)
+            if bloqueado or status in (403, 429, 503):
+                e['intervalo'] = min(e['max'], e['intervalo'] * FATOR_RECUO)
+                e['recuos'] += 1
+                pausa = retry_after if retry_after else e['intervalo']
+                e['pausa_ate'] = time.monotonic() + min(pausa, e['max'])
+            elif duracao is not None and duracao > RESPOSTA_LENTA_S:
+                e['intervalo'] = min(e['max'], e['intervalo'] * FATOR_LENTIDAO)
+            else:
+                e['intervalo'] = max(e['min'], e['intervalo'] * FATOR_ACELERA)
+
+    def resumo(self, plataforma=None):
+        with self._lock:
+            return {
+                host: {k: e[k] for k in ('intervalo', 'requisicoes', 'recuos', 'espera_total')}
+                for host, e in self._hosts.items()
+                if plataforma is None or e['plataforma'] == plataforma
+            }
+
+
+LIMITADOR = Limitador()
+
+
+# Modo multiprocesso: um único Limitador, num processo gerente, atende todos
+# os workers — um host dividido entre processos continua no ritmo de RITMO.
+class GerenteRitmo(multiprocessing.managers.BaseManager):
+    pass
+
+GerenteRitmo.register("Limitador", Limitador, exposed=("reservar", "registrar", "resumo"))
+
+class LimitadorCompartilhado:
+    """Fachada do Limitador do GerenteRitmo; a espera acontece no próprio worker."""
+
+    def __init__(self, proxy):
+        self._proxy = proxy
+
+    def aguardar(self, host, plataforma=None):
+        espera = self._proxy.reservar(host, plataforma)
+        if espera:
+            time.sleep(espera)
+
+    def registrar(self, host, status=None, duracao=None, bloqueado=False, retry_after=None):
+        self._proxy.registrar(host, status, duracao, bloqueado, retry_after)
+
+    def resumo(self, plataforma=None):
+        return self._proxy.resumo(plataforma)
+
+
+def _retry_after(resposta):
+    try:
+        valor = resposta.headers.get("retry-after")
+        return float(valor) if valor else None
+    except (AttributeError, ValueError):
+        return None
+
+def aguardar_vez(plataforma, url):
+    """Espera o token do host no LIMITADOR (span "espera")."""
+    with etapa("espera"):
+        LIMITADOR.aguardar(urllib.parse.urlsplit(url).hostname, plataforma)
+
+# Erros do Playwright que significam browser/contexto morto: insistir na
+# mesma página não adianta, o worker precisa reabrir o navegador.
+MARCADORES_NAVEGADOR_CAIU = [
+    'has been closed', 'target closed', 'browser closed',
+    'connection closed', 'disconnected',
+]
+
+class NavegadorCaiu(Exception):
+    """Browser/contexto/página fechados — sobe até o worker, que reabre o navegador."""
+
+def navegador_caiu(erro):
+    texto = str(erro).lower()
+    return any(m in texto for m in MARCADORES_NAVEGADOR_CAIU)
+
+def navegar(page, plataforma, url, wait_until="domcontentloaded", timeout=30000, aguardar=True):
+    """page.goto com ritmo por host: espera o token antes, ajusta o ritmo depois.
+
+    Com aguardar=False a espera já foi feita por aguardar_vez() — usado
+    quando o goto roda dentro de um expect_response com timeout próprio.
+    """
+    host = urllib.parse.urlsplit(url).hostname
+    if aguardar:
+        aguardar_vez(plataforma, url)
+    inicio = time.monotonic()
+    try:
+        with etapa("goto"):
+            resposta = page.goto(url, wait_until=wait_until, timeout=timeout)
+    except Exception as e:
+        if navegador_caiu(e):
+            raise NavegadorCaiu(str(e)) from e
+        LIMITADOR.registrar(host, duracao=time.monotonic() - inicio + RESPOSTA_LENTA_S)
+        raise
+    duracao = time.monotonic() - inicio
+    status  = resposta.status if resposta else None
+    try:
+        bloqueado = page.evaluate(MARCADORES_BLOQUEIO_JS, MARCADORES_BLOQUEIO)
+    except Exception:
+        bloqueado = False
+    if bloqueado or status in (403, 429):
+        log(f"   [{plataforma}] 🚧 Sinal de bloqueio (HTTP {status}) — reduzindo o ritmo")
+    LIMITADOR.registrar(host, status, duracao, bloqueado, _retry_after(resposta))
+    return resposta
+
+
+# ================================================================
+# SELETORES POR PLATAFORMA
+# Listas de fallback: o primeiro seletor que trouxer valor vence.
+# São usadas tanto na extração em lote no navegador quanto fora dele.
+# ================================================================
+SELETORES = {
+    "Indeed": {
+        "card":    ['div.job_seen_beacon'],
+        "titulo":  ['[data-testid="jobTitle"] span', 'h2.jobTitle a span', 'a.jcs-JobTitle span'],
+        "empresa": ['[data-testid="company-name"]', 'span.companyName', '[class*="companyName"]'],
+        "local":   ['[data-testid="text-location"]'],
+        "link":    ['h2.jobTitle a', 'a.jcs-JobTitle', '[data-testid="jobTitle"] a'],
+    },
+    # Gupy: estrutura Styled Components + data-testid
+    "Gupy": {
+        "card": [
+            '[data-testid="job-card"]',
+            'li[data-testid*="job"]',
+            'div[data-testid*="job"]',
+            'a[data-testid*="job-card"]',
+            'div[class*="JobCard"]',
+            'li[class*="JobCard"]',
+            'div[class*="sc-"][class*="job"]',
+        ],
+        # Gupy mostra título em h3 ou elemento com data-testid
+        "titulo": [
+            '[data-testid="job-name"]', '[data-testid="job-title"]',
+            'h3', 'h2', '[class*="jobName"]', '[class*="JobName"]',
+            '[class*="title"]',
+        ],
+        "empresa": [
+            '[data-testid="company-name"]', '[data-testid="job-company"]',
+            '[class*="companyName"]', '[class*="CompanyName"]',
+            '[class*="company"]', 'span[class*="sc-"]',
+        ],
+        "local":   [],
+        "link":    ['a'],
+    },
+    # Vagas.com: título no h2.cargo, empresa em span.empresa (muitas vezes "Confidencial")
+    "Vagas.com": {
+        "card":    ['li.vaga', '.opportunity'],
+        "titulo":  ['h2.cargo a', 'h2.cargo', 'a.link-detalhes-vaga', 'h2 a'],
+        "empresa": ['span.empresa', 'a.empresa', '.empresa', '[class*="empresa"]'],
+        "local":   ['span.localidade', '.localidade', '[class*="localidade"]'],
+        "link":    ['h2.cargo a', 'a.link-detalhes-vaga', 'a'],
+    },
+    "Catho": {
+        "card": [
+            '[data-testid="job-card"]',
+            'article[class*="JobCard"]',
+            'div[class*="JobCard"]',
+            'li[class*="job-item"]',
+            'div[class*="job-card"]',
+            '[class*="sc-"][class*="Card"]',
+        ],
+        "titulo": [
+            '[data-testid="job-title"]',
+            'h2[class*="Title"] a', 'h3[class*="Title"] a',
+            'h2 a', 'h3 a', 'h2', 'h3',
+            'a[class*="title"]', 'a[class*="Title"]',
+            '[class*="title"]', '[class*="Title"]',
+        ],
+        "empresa": ['[data-testid="company-name"]', '[class*="company"]', '[class*="Company"]'],
+        "local":   ['[data-testid="job-location"]', '[class*="location"]', '[class*="Location"]'],
+        "link":    ['a'],
+    },
+    "InfoJobs": {
+        "card": [
+            'li.ij-OfferCardBasic',
+            'li[class*="OfferCard"]',
+            'li[class*="offer"]',
+            'div[class*="OfferCard"]',
+            '.boxVaga',
+            'li.boxVaga',
+            '[class*="offer-item"]',
+        ],
+        "titulo": [
+            'h2 a', 'h3 a', 'a[class*="Title"]', 'a[class*="title"]',
+            '[class*="title"] a', '[class*="tituloVaga"] a',
+            '.tituloVaga a', '.ic1_titulo a',
+        ],
+        "empresa": [
+            '[class*="company"]', '[class*="Company"]',
+            '[class*="empresa"]', '.nomeEmpresa', 'span[class*="Employer"]',
+        ],
+        "local":   ['[class*="location"]', '[class*="cidade"]', '[class*="city"]', '.localVaga'],
+        "link":    ['a'],
+    },
+    # sine.com.br usa cards com classe .vaga-lista ou similar
+    "SINE": {
+        "card": [
+            'li.vaga-lista', 'li[class*="vaga"]',
+            'div[class*="vaga-item"]', 'article[class*="vaga"]',
+            '.resultado-vaga', 'li.resultado',
+            '.vaga',
+        ],
+        "titulo":  ['h2 a', 'h3 a', 'a[class*="title"]', 'a[class*="cargo"]', 'a'],
+        "empresa": ['[class*="empresa"]', '[class*="company"]', 'span[class*="nome"]'],
+        "local":   [],
+        "link":    ['a'],
+    },
+}
+
+# Prefixos que indicam página editorial do Catho, não vaga real
+CATHO_EDITORIAL = (
+    "o que o ", "vagas relacionadas", "empregos de ",
+    "o que faz", "salário de ", "como ser ",
+)
+
+def _titulo_relevante(titulo, cargo):
+    """Vagas.com devolve resultados sem relação com o cargo buscado."""
+    palavras_cargo = [w.lower() for w in cargo.split() if len(w) > 3]
+    titulo_lower = titulo.lower()
+    return not palavras_cargo or any(p in titulo_lower for p in palavras_cargo)
+
+def _titulo_nao_editorial(titulo, cargo):
+    return not any(titulo.lower().startswith(p) for p in CATHO_EDITORIAL)
+
+# Como transformar os valores brutos de cada card em uma vaga
+REGRAS_MONTAGEM = {
+    "Indeed":    {'base': "https://br.indeed.com"},
+    "Gupy":      {'base': "https://portal.gupy.io", 'titulo_min': 4, 'primeira_linha': True},
+    "Vagas.com": {'base': "https://www.vagas.com.br", 'empresa_padrao': "Confidencial",
+                  'filtro': _titulo_relevante},
+    "Catho":     {'base': "https://www.catho.com.br", 'filtro': _titulo_nao_editorial},
+    "InfoJobs":  {'base': "https://www.infojobs.com.br"},
+    "SINE":      {'base': "https://www.sine.com.br", 'titulo_min': 4, 'primeira_linha': True},
+}
+
+
+# ================================================================
+# ESTATÍSTICAS DE SELETORES
+# Cada varredura registra quais seletores de card/campo realmente casaram.
+# Na próxima, as listas são testadas na ordem de sucesso observado e os
+# que não casam há SELETOR_DEMOVER_APOS execuções vão para o fim, com
+# timeout curto — o probe de cards deixa de pagar 6–8 s por seletor morto.
+# ================================================================
+SELETOR_DEMOVER_APOS     = 5      # execuções sem acerto até rebaixar
+TIMEOUT_SELETOR_DEMOVIDO = 1000   # ms de espera para seletor rebaixado
+
+ORDEM_SELETORES = {}   # { plataforma: { campo: [seletores] } } — carregada do banco
+DEMOVIDOS       = {}   # { plataforma: {(campo, seletor), ...} }
+_acertos        = {}   # { (plataforma, campo, seletor): [acertos, tentativas] }
+_acertos_lock   = threading.Lock()
+
+def seletores_ordenados(plataforma, campo):
+    return ORDEM_SELETORES.get(plataforma, {}).get(campo, SELETORES[plataforma][campo])
+
+def registrar_acerto(plataforma, campo, seletor, acertou=True):
+    with _acertos_lock:
+        contagem = _acertos.setdefault((plataforma, campo, seletor), [0, 0])
+        contagem[0] += int(acertou)
+        contagem[1] += 1
+
+def coletar_acertos(plataforma):
+    """Retira (e devolve) os acertos acumulados de uma plataforma."""
+    with _acertos_lock:
+        chaves = [k for k in _acertos if k[0] == plataforma]
+        return {k: _acertos.pop(k) for k in chaves}
+
+def carregar_ordem_seletores(conn):
+    """(Re)calcula ORDEM_SELETORES/DEMOVIDOS a partir do banco.
+
+    Cada plataforma é trocada de uma vez: no daemon isto roda com os
+    workers ativos, que nunca veem uma ordem pela metade.
+    """
+    execucoes = dict(conn.execute("SELECT plataforma, execucoes FROM seletor_execucoes"))
+    stats = {
+        (plat, campo, sel): (acertos, ultima)
+        for plat, campo, sel, acertos, ultima in conn.execute(
+            "SELECT plataforma, campo, seletor, acertos, ultima_execucao FROM seletor_stats")
+    }
+    for plat, campos in SELETORES.items():
+        n = execucoes.get(plat, 0)
+        ordem, demovidos = {}, set()
+        for campo, lista in campos.items():
+            chaves = {}
+            for idx, sel in enumerate(lista):
+                acertos, ultima = stats.get((plat, campo, sel), (0, None))
+                demovido = n >= SELETOR_DEMOVER_APOS and n - (ultima or 0) >= SELETOR_DEMOVER_APOS
+                if demovido:
+                    demovidos.add((campo, sel))
+                # Campos: a ordem também é prioridade, então só quem já venceu sobe
+                chaves[sel] = (demovido, -acertos, idx)
+            ordem[campo] = sorted(lista, key=chaves.get)
+        ORDEM_SELETORES[plat] = ordem
+        DEMOVIDOS[plat] = demovidos
+
+def salvar_estatisticas_seletores(conn, acertos, plataformas):
+    """Persiste os acertos da varredura e conta mais uma execução por plataforma."""
+    with conn:
+        for plat in plataformas:
+            conn.execute('''
+                INSERT INTO seletor_execucoes (plataforma, execucoes) VALUES (?, 1)
+                ON CONFLICT(plataforma) DO UPDATE SET execucoes = execucoes + 1
+            ''', (plat,))
+        execucoes = dict(conn.execute("SELECT plataforma, execucoes FROM seletor_execucoes"))
+        conn.executemany('''
+            INSERT INTO seletor_stats (plataforma, campo, seletor, acertos, tentativas, ultima_execucao)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(plataforma, campo, seletor) DO UPDATE SET
+                acertos         = acertos + excluded.acertos,
+                tentativas      = tentativas + excluded.tentativas,
+                ultima_execucao = COALESCE(excluded.ultima_execucao, ultima_execucao)
+        ''', [
+            (plat, campo, sel, a, t, execucoes.get(plat) if a else None)
+            for (plat, campo, sel), (a, t) in acertos.items()
+        ])
+
+@cronometrado("seletor_card")
+def encontrar_card(page, plataforma, timeout):
+    """Primeiro seletor de card (na ordem aprendida) com resultados na página."""
+    demovidos = DEMOVIDOS.get(plataforma, set())
+    for sel in seletores_ordenados(plataforma, 'card'):
+        espera = TIMEOUT_SELETOR_DEMOVIDO if ('card', sel) in demovidos else timeout
+        try:
+            page.wait_for_selector(sel, timeout=espera)
+            if page.locator(sel).count() > 0:
+                registrar_acerto(plataforma, 'card', sel)
+                return sel
+        except Exception:
+            pass
+        registrar_acerto(plataforma, 'card', sel, acertou=False)
+    return None
+
+
+# ================================================================
+# EXTRAÇÃO EM LOTE
+# Um único page.evaluate por página de resultados: o navegador aplica
+# todas as listas de fallback e devolve os cards como JSON.
+# ================================================================
+EXTRATOR_JS = """
+([seletorCard, campos]) => Array.from(document.querySelectorAll(seletorCard)).map(card => {
+    const bruto = {texto: card.innerText || '', html: card.outerHTML, campos: {}};
+    for (const [campo, lista] of Object.entries(campos)) {
+        bruto.campos[campo] = [];
+        for (const sel of lista) {
+            let el = null;
+            try { el = card.querySelector(sel); } catch (e) { continue; }
+            if (!el) continue;
+            const valor = campo === 'link' ? el.getAttribute('href') : el.innerText;
+            if (valor && valor.trim()) bruto.campos[campo].push([sel, valor.trim()]);
+        }
+    }
+    return bruto;
+})
+"""
+
+def _campos(plataforma):
+    return {c: seletores_ordenados(plataforma, c) for c in SELETORES[plataforma] if c != "card"}
+
+def extrair_cards(page, plataforma, seletor_card):
+    """Retorna os cards como dicts {'texto', 'html', 'campos': {campo: [[seletor, valor], ...]}}."""
+    return page.evaluate(EXTRATOR_JS, [seletor_card, _campos(plataforma)])
+
+def _primeiro_valor(bruto, campo, aceitar=None, plataforma=None):
+    for seletor, valor in bruto['campos'].get(campo, []):
+        if aceitar is None or aceitar(valor):
+            if plataforma:
+                registrar_acerto(plataforma, campo, seletor)
+            return valor
+    return None
+
+def montar_vagas(brutos, plataforma, url, cargo):
+    regras = REGRAS_MONTAGEM[plataforma]
+    titulo_min = regras.get('titulo_min', 1)
+    filtro     = regras.get('filtro')
+
+    vagas = []
+    for bruto in brutos:
+        titulo = _primeiro_valor(bruto, 'titulo', lambda v: len(v) >= titulo_min, plataforma) or ""
+        if not titulo and regras.get('primeira_linha'):
+            # Fallback: primeira linha do texto do card
+            linhas = [l.strip() for l in bruto['texto'].split('\n') if l.strip()]
+            if linhas: titulo = linhas[0]
+        if not titulo: continue
+        if filtro and not filtro(titulo, cargo): continue
+
+        empresa = (_primeiro_valor(bruto, 'empresa', lambda v: v != titulo, plataforma)
+                   or regras.get('empresa_padrao', "Não informada"))
+        local_vaga = _primeiro_valor(bruto, 'local', plataforma=plataforma) or CIDADE_UF
+
+        link = url
+        href = _primeiro_valor(bruto, 'link', plataforma=plataforma)
+        if href:
+            link = f"{regras['base']}{href}" if href.startswith("/") else href
+
+        keywords, score = avaliar_vip(bruto['texto'])
+        vagas.append({
+            'id':           montar_id(titulo, empresa, plataforma),
+            'titulo':       titulo,
+            'empresa':      empresa,
+            'local':        local_vaga,
+            'link':         link,
+            'plataforma':   plataforma,
+            'match_vip':    score >= SCORE_MIN_VIP,
+            'score_vip':    score,
+            'keywords_vip': keywords,
+            'data_publicacao': data_publicacao(bruto['texto']),
+            'texto':        bruto['texto'],
+            'captura':      ("html", bruto.get('html')),
+        })
+    return vagas
+
+
+# ================================================================
+# IMPRESSÃO DIGITAL DAS PÁGINAS DE RESULTADO
+# Hash da sequência de hrefs dos cards, guardado por URL de busca. Se a
+# página está igual à da última varredura, nada nela é novo: pulamos a
+# extração por card, a montagem das vagas e a consulta ao banco.
+# ================================================================
+HREFS_JS = """
+(seletorCard) => Array.from(document.querySelectorAll(seletorCard)).map(card => {
+    const a = card.matches('a[href]') ? card : card.querySelector('a[href]');
+    return a ? a.getAttribute('href') : (card.textContent || '').trim().slice(0, 80);
+})
+"""
+
+IMPRESSOES = {}                 # { url: hash } — carregado do banco no início
+_impressoes_pendentes = {}      # { plataforma: [(url, hash, [ids])] }
+_impressoes_contagem  = {}      # { plataforma: {'iguais': n, 'diferentes': n} }
+_impressoes_lock      = threading.Lock()
+
+def impressao_de_hrefs(hrefs):
+    return hashlib.sha1("\n".join(hrefs).encode("utf-8")).hexdigest()
+
+def impressao_repetida(plataforma, url, impressao):
+    igual = IMPRESSOES.get(url) == impressao
+    with _impressoes_lock:
+        contagem = _impressoes_contagem.setdefault(plataforma, {'iguais': 0, 'diferentes': 0})
+        contagem['iguais' if igual else 'diferentes'] += 1
+    if igual:
+        log(f"   [{plataforma}] ≡ Página igual à da última varredura — extração pulada")
+    return igual
+
+def guardar_impressao(plataforma, url, impressao, vagas):
+    """Anota a impressão nova; o orquestrador só grava se todas as vagas entrarem no banco."""
+    with _impressoes_lock:
+        _impressoes_pendentes.setdefault(plataforma, []).append(
+            (url, impressao, [v['id'] for v in vagas]))
+
+def coletar_impressoes(plataforma):
+    with _impressoes_lock:
+        return _impressoes_pendentes.pop(plataforma, [])
+
+def contagem_impressoes(plataforma):
+    """Retira (e devolve) a contagem de páginas iguais/diferentes da plataforma."""
+    with _impressoes_lock:
+        return _impressoes_contagem.pop(plataforma, {'iguais': 0, 'diferentes': 0})
+
+def extrair_pagina(page, plataforma, url, cargo, seletor_card):
+    """extrair_cards + montar_vagas, a menos que a página seja a mesma da última vez."""
+    # Banners carregados com atraso só aparecem depois dos cards: segunda passada.
+    # Fica fora do span "extracao" para as fases não se sobreporem no --stats.
+    fechar_popups(page)
+    return _extrair_pagina(page, plataforma, url, cargo, seletor_card)
+
+@cronometrado("extracao")
+def _extrair_pagina(page, plataforma, url, cargo, seletor_card):
+    impressao = impressao_de_hrefs(page.evaluate(HREFS_JS, seletor_card))
+    if impressao_repetida(plataforma, url, impressao):
+        return []
+    vagas = montar_vagas(extrair_cards(page, plataforma, seletor_card), plataforma, url, cargo)
+    guardar_impressao(plataforma, url, impressao, vagas)
+    return vagas
+
+
+# ================================================================
+# EXTRAÇÃO OFFLINE (HTML estático, sem Chromium)
+# Caminho rápido para sites renderizados no servidor e replay dos
+# debug_*.html salvos.
+# ================================================================
+def vagas_do_html(html, plataforma, url="", cargo="", chave_impressao=None):
+    """Aplica SELETORES/REGRAS_MONTAGEM a um HTML já baixado.
+
+    Retorna (vagas, seletor_card_usado) — ([], None) se nenhum card casar.
+    Com `chave_impressao`, devolve ([], seletor) se a página não mudou
+    desde a última varredura.
+    """
+    raiz = parse_html(html)
+    for sel in seletores_ordenados(plataforma, 'card'):
+        cards = raiz.select(sel)
+        if not cards:
+            continue
+        registrar_acerto(plataforma, 'card', sel)
+        impressao = None
+        if chave_impressao:
+            impressao = impressao_de_hrefs(_href_do_card(c) for c in cards)
+            if impressao_repetida(plataforma, chave_impressao, impressao):
+                return [], sel
+        vagas = montar_vagas(extrair_cards_html(raiz, sel, _campos(plataforma)), plataforma, url, cargo)
+        if impressao:
+            guardar_impressao(plataforma, chave_impressao, impressao, vagas)
+        return vagas, sel
+    return [], None
+
+def _href_do_card(card):
+    link = card if card.tag == "a" and card.get("href") else card.select_one("a[href]")
+    return link.get("href") if link is not None else card.texto()[:80]
+
+def plataforma_do_arquivo(caminho):
+    """debug_vagascom.html → 'Vagas.com' (mesma convenção de salvar_debug_html)."""
+    nome = os.path.basename(caminho).lower()
+    for plataforma in SELETORES:
+        if f"debug_{plataforma.lower().replace('.', '')}" in nome:
+            return plataforma
+    return None
+
+def replay(arquivos):
+    """Reprocessa HTMLs salvos e mostra as vagas extraídas — sem rede, sem banco."""
+    for caminho in arquivos:
+        plataforma = plataforma_do_arquivo(caminho)
+        if not plataforma:
+            log(f"⚠️ {caminho}: plataforma não reconhecida pelo nome do arquivo")
+            continue
+        with open(caminho, encoding="utf-8") as f:
+            html = f.read()
+        if not html.strip():
+            log(f"[{plataforma}] {caminho}: arquivo vazio")
+            continue
+        inicio = time.perf_counter()
+        vagas, seletor = vagas_do_html(html, plataforma)
+        ms = (time.perf_counter() - inicio) * 1000
+        log(f"[{plataforma}] {caminho}: {len(vagas)} vagas em {ms:.1f} ms (card: {seletor or '—'})")
+        for vaga in vagas:
+            prefixo = "🔥 VIP" if vaga['match_vip'] else "  -  "
+            log(f"   {prefixo} {vaga['titulo']} | {vaga['empresa']} | {vaga['local']}")
+
+
+# ================================================================
+# RECLASSIFICAÇÃO OFFLINE (--rescore)
+# Reaplica avaliar_vip ao histórico inteiro depois de mudar KEYWORDS_VIP,
+# PESOS_VIP ou SCORE_MIN_VIP — sem rede: usa o texto gravado ou, se ele
+# estiver vazio, a captura comprimida. Vagas sem nenhum dos dois (gravadas
+# antes do texto/arquivo existirem) ficam como estão: o VIP delas veio do
+# card inteiro, e título + empresa não bastam para refazer a conta.
+# ================================================================
+LOTE_RESCORE = 5000
+
+def texto_da_captura(formato, conteudo):
+    bruto = zlib.decompress(conteudo).decode("utf-8")
+    if formato == "json":
+        item = json.loads(bruto)
+        return "\n".join(str(item.get(k)) for k in (
+            'name', 'careerPageName', 'city', 'state', 'description', 'workplaceType') if item.get(k))
+    return parse_html(bruto).texto()
+
+def vip_canonicas(conn):
+    return {i for (i,) in conn.execute("SELECT id FROM vagas WHERE cluster_id = id AND vip_cluster = 1")}
+
+def rescore():
+    conn = abrir_db()
+    init_db(conn)
+    inicio = time.perf_counter()
+    total = alteradas = sem_texto = 0
+    ultimo = 0
+    vip_antes = vip_canonicas(conn)
+    while True:
+        # Paginação por rowid: lotes constantes e sem cursor aberto durante o UPDATE
+        lote = conn.execute('''
+            SELECT v.rowid, v.titulo, v.empresa, v.texto, v.match_vip, v.score_vip, v.keywords_vip,
+                   c.formato, c.conteudo
+            FROM vagas v LEFT JOIN capturas c ON c.vaga_id = v.id
+            WHERE v.rowid > ? ORDER BY v.rowid LIMIT ?
+        ''', (ultimo, LOTE_RESCORE)).fetchall()
+        if not lote:
+            break
+        atualizacoes = []
+        for rowid, titulo, empresa, texto, vip, score_antigo, kw_antigas, formato, conteudo in lote:
+            if not texto and conteudo:
+                texto = texto_da_captura(formato, conteudo)
+            if not texto:
+                sem_texto += 1
+                continue
+            keywords, score = avaliar_vip(texto)
+            match_vip = score >= SCORE_MIN_VIP
+            kw = ", ".join(keywords)
+            if (bool(vip), score_antigo, kw_antigas or "") != (match_vip, score, kw):
+                atualizacoes.append((match_vip, score, kw, rowid))
+        with conn:
+            conn.executemany(
+                "UPDATE vagas SET match_vip = ?, score_vip = ?, keywords_vip = ? WHERE rowid = ?",
+                atualizacoes)
+        total += len(lote)
+        alteradas += len(atualizacoes)
+        ultimo = lote[-1][0]
+    # VIP dos clusters recalculado a partir dos scores próprios já atualizados
+    consolidar_clusters(conn)
+    vip_depois = vip_canonicas(conn)
+    ganharam, perderam = len(vip_depois - vip_antes), len(vip_antes - vip_depois)
+    conn.close()
+    log(f">>> Reclassificadas {total} vagas em {time.perf_counter() - inicio:.1f} s: "
+        f"{alteradas} alteradas | {ganharam} viraram VIP | {perderam} deixaram de ser VIP | "
+        f"{sem_texto} sem texto (mantidas)")
+
+
+# ================================================================
+# BUSCA VIA HTTP (sem navegador)
+# Sites que entregam os resultados no HTML inicial são baixados com um
+# cliente keep-alive e parseados direto; o Playwright só entra quando a
+# resposta parece bloqueada ou a requisição falha. Um 200 sem cards é uma
+# busca sem resultados (ou o fim da paginação), não um motivo para trocar.
+# ================================================================
+# "http" = tenta HTTP primeiro; plataformas ausentes usam só o navegador
+MODO_BUSCA = {
+    "Vagas.com": "http",
+    "Indeed":    "http",
+}
+
+# Depois do primeiro bloqueio (403/429/503 ou marcador anti-bot), o HTTP sai
+# de cena até o fim da varredura: insistir só dobraria o intervalo do host no LIMITADOR,
+# e o navegador pagaria esse recuo também.
+_http_desativado = set()
+
+def usar_http(plataforma):
+    return MODO_BUSCA.get(plataforma) == "http" and plataforma not in _http_desativado
+
+def reativar_http(plataforma):
+    """Chamado no início de cada varredura do worker."""
+    _http_desativado.discard(plataforma)
+
+def _desativar_http(plataforma):
+    if plataforma not in _http_desativado:
+        _http_desativado.add(plataforma)
+        log(f"   [{plataforma}] ↪ HTTP desativado até o fim da varredura — só navegador")
+
+HEADERS_HTTP = {
+    "User-Agent":      USER_AGENT,
+    "Accept":          "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.7",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection":      "keep-alive",
+}
+
+
+class ClienteHTTP:
+    """Uma conexão persistente por host — e por thread, já que cada worker usa a sua."""
+
+    def __init__(self, timeout=20):
+        self.timeout = timeout
+        self._local  = threading.local()
+
+    def _conexoes(self):
+        return self._local.__dict__.setdefault('conexoes', {})
+
+    def _conexao(self, esquema, host):
+        conexoes = self._conexoes()
+        chave = (esquema, host)
+        if chave not in conexoes:
+            classe = http.client.HTTPSConnection if esquema == "https" else http.client.HTTPConnection
+            conexoes[chave] = classe(host, timeout=self.timeout)
+        return conexoes[chave]
+
+    def _descartar(self, esquema, host):
+        """Fecha a conexão: depois de um erro ela fica num estado que não aceita outro request."""
+        conexao = self._conexoes().pop((esquema, host), None)
+        if conexao is not None:
+            conexao.close()
+
+    def get(self, url, max_redirecionamentos=5):
+        """Retorna (status, headers, html, url_final)."""
+        for _ in range(max_redirecionamentos + 1):
+            partes  = urllib.parse.urlsplit(url)
+            caminho = partes.path or "/"
+            if partes.query:
+                caminho += "?" + partes.query
+            for tentativa in range(2):
+                conexao = self._conexao(partes.scheme, partes.netloc)
+                try:
+                    conexao.request("GET", caminho, headers=HEADERS_HTTP)
+                    resposta = conexao.getresponse()
+                    corpo = resposta.read()
+                    break
+                except Exception as e:
+                    self._descartar(partes.scheme, partes.netloc)
+                    # keep-alive fechado pelo servidor: reabre uma vez; o resto sobe
+                    if tentativa or not isinstance(
+                            e, (http.client.RemoteDisconnected, ConnectionError, http.client.BadStatusLine)):
+                        raise
+            if resposta.status in (301, 302, 303, 307, 308) and resposta.getheader("Location"):
+                url = urllib.parse.urljoin(url, resposta.getheader("Location"))
+                continue
+            return resposta.status, resposta.headers, self._decodificar(resposta, corpo), url
+        raise http.client.HTTPException(f"redirecionamentos demais: {url}")
+
+    @staticmethod
+    def _decodificar(resposta, corpo):
+        codificacao = (resposta.getheader("Content-Encoding") or "").lower()
+        if codificacao == "gzip":
+            corpo = gzip.decompress(corpo)
+        elif codificacao == "deflate":
+            # RFC 9110: "deflate" é o formato zlib (RFC 1950); alguns servidores
+            # mandam o deflate cru, sem o cabeçalho zlib
+            try:
+                corpo = zlib.decompress(corpo, zlib.MAX_WBITS | 32)
+            except zlib.error:
+                corpo = zlib.decompress(corpo, -zlib.MAX_WBITS)
+        charset = resposta.headers.get_content_charset() or "utf-8"
+        return corpo.decode(charset, errors="replace")
+
+
+CLIENTE_HTTP = ClienteHTTP()
+
+
+def parece_bloqueado(status, html):
+    if status in (403, 429, 503):
+        return True
+    inicio = html[:20000].lower()
+    return any(m in inicio for m in MARCADORES_BLOQUEIO)
+
+def buscar_via_http(plataforma, url, cargo):
+    """Vagas via HTTP + parser offline; None quando é preciso cair para o navegador."""
+    host = urllib.parse.urlsplit(url).hostname
+    with etapa("espera"):
+        LIMITADOR.aguardar(host, plataforma)
+    inicio = time.monotonic()
+    try:
+        with etapa("http"):
+            status, headers, html, url_final = CLIENTE_HTTP.get(url)
+    except Exception as e:
+        LIMITADOR.registrar(host, duracao=time.monotonic() - inicio + RESPOSTA_LENTA_S)
+        log(f"   [{plataforma}] ⚠️ HTTP falhou: {e}")
+        return None
+
+    bloqueado = parece_bloqueado(status, html)
+    retry = headers.get("Retry-After")
+    LIMITADOR.registrar(host, status, time.monotonic() - inicio, bloqueado,
+                        float(retry) if retry and retry.isdigit() else None)
+    if bloqueado:
+        log(f"   [{plataforma}] 🚧 HTTP {status} bloqueado")
+        _desativar_http(plataforma)
+        return None
+    if status != 200:
+        log(f"   [{plataforma}] ⚠️ HTTP {status} inesperado")
+        return None
+
+    with etapa("extracao"):
+        vagas, _ = vagas_do_html(html, plataforma, url_final, cargo, chave_impressao=url)
+    # Sem seletor de card que case: busca sem resultados ou página além do fim
+    return vagas
+
+
+# ================================================================
+# PAGINAÇÃO COM MARCA D'ÁGUA
+# Cada busca segue para as próximas páginas de resultados até:
+#   - a página vir vazia ou repetida (parâmetro ignorado pelo site);
+#   - todos os IDs da página já estarem no banco;
+#   - todas as datas de publicação conhecidas serem anteriores à última
+#     varredura desse (plataforma, cargo).
+# Assim a cobertura cresce sem o custo crescer com o histórico.
+# ================================================================
+MAX_PAGINAS = 5
+
+# Parâmetro de página de cada site: valor = inicio + (pagina - 1) * passo
+PAGINACAO = {
+    "Indeed":    {'parametro': 'start',  'inicio': 0, 'passo': 10},
+    "Gupy":      {'parametro': 'page',   'inicio': 1, 'passo': 1},
+    "Vagas.com": {'parametro': 'pagina', 'inicio': 1, 'passo': 1},
+    "Catho":     {'parametro': 'page',   'inicio': 1, 'passo': 1},
+    "InfoJobs":  {'parametro': 'page',   'inicio': 1, 'passo': 1},
+    "SINE":      {'parametro': 'pagina', 'inicio': 1, 'passo': 1},
+}
+
+IDS_CONHECIDOS     = set()  # IDs no banco — compartilhado com o orquestrador
+ULTIMAS_VARREDURAS = {}     # { (plataforma, cargo): datetime da última varredura }
+
+def url_da_pagina(url, plataforma, pagina):
+    """A página 1 é a URL original; as demais ganham o parâmetro da plataforma."""
+    cfg = PAGINACAO.get(plataforma)
+    if pagina <= 1 or not cfg:
+        return url
+    partes = urllib.parse.urlsplit(url)
+    query  = [(k, v) for k, v in urllib.parse.parse_qsl(partes.query, keep_blank_values=True)
+              if k != cfg['parametro']]
+    query.append((cfg['parametro'], str(cfg['inicio'] + (pagina - 1) * cfg['passo'])))
+    return urllib.parse.urlunsplit(partes._replace(query=urllib.parse.urlencode(query)))
+
+_DATA_RELATIVA = re.compile(
+    r"\b(?:(hoje|agora)|(ontem)|ha (?:mais de )?(\d+)\+? (minuto|hora|dia|semana|mes|meses))"
+)
+
+def data_publicacao(texto):
+    """Data (ISO) a partir de 'Publicada há 3 dias', 'Hoje', 'Ontem'... ou None."""
+    m = _DATA_RELATIVA.search(normalizar(texto))
+    if not m:
+        return None
+    hoje = datetime.date.today()
+    if m.group(1):
+        return hoje.isoformat()
+    if m.group(2):
+        return (hoje - datetime.timedelta(days=1)).isoformat()
+    n, unidade = int(m.group(3)), m.group(4)
+    dias = {'minuto': 0, 'hora': 0, 'dia': n, 'semana': 7 * n}.get(unidade, 30 * n)
+    return (hoje - datetime.timedelta(days=dias)).isoformat()
+
+def _data(valor):
+    try:
+        return datetime.date.fromisoformat(str(valor)[:10])
+    except ValueError:
+        return None
+
+def paginar(plataforma, cargo, buscar_pagina):
+    """Chama buscar_pagina(n) para n = 1, 2, ... até a regra de parada."""
+    ultima = ULTIMAS_VARREDURAS.get((plataforma, cargo))
+    vistas, todas = set(), []
+    for pagina in range(1, MAX_PAGINAS + 1):
+        vagas = [v for v in buscar_pagina(pagina) if v['id'] not in vistas]
+        if not vagas:
+            break
+        vistas.update(v['id'] for v in vagas)
+        todas.extend(vagas)
+
+        if all(v['id'] in IDS_CONHECIDOS for v in vagas):
+            log(f"   [{plataforma}] ⏹ Página {pagina} só com vagas conhecidas — parando")
+            break
+        # salvar_lote só guarda MAX_VAGAS_CARGO novas: mais páginas seriam descartadas
+        if sum(v['id'] not in IDS_CONHECIDOS for v in todas) >= MAX_VAGAS_CARGO:
+            log(f"   [{plataforma}] ⏹ {MAX_VAGAS_CARGO} vagas novas já coletadas — parando")
+            break
+        datas = [d for d in (_data(v.get('data_publicacao')) for v in vagas) if d]
+        if ultima and datas and max(datas) < ultima.date():
+            log(f"   [{plataforma}] ⏹ Página {pagina} anterior à última varredura — parando")
+            break
+    return todas
+
+
 # ================================================================
 # PLATAFORMA 1 — INDEED BRASIL
 # URL: br.indeed.com
 # Parâmetros: fromage=7 (7 dias) | radius=10 (10 km) | sort=date
 # ================================================================
-def buscar_no_indeed(page, cargo):
+def buscar_no_indeed(page, cargo, pagina=1):
     plataforma = "Indeed"
     url = (
         "https://br.indeed.com/jobs"
@@ -168,74 +1729,30 @@ def buscar_no_indeed(page, cargo):
         f"&l={urllib.parse.quote(CIDADE_UF)}"
         "&fromage=7&radius=10&sort=date"
     )
-    log(f"   [{plataforma}] {cargo}")
+    url = url_da_pagina(url, plataforma, pagina)
+    log(f"   [{plataforma}] {cargo}" + (f" — página {pagina}" if pagina > 1 else ""))
+
+    if usar_http(plataforma):
+        vagas = buscar_via_http(plataforma, url, cargo)
+        if vagas is not None:
+            log(f"   [{plataforma}] {len(vagas)} vagas encontradas (HTTP)")
+            return vagas
+        log(f"   [{plataforma}] ↪ HTTP indisponível — usando o navegador")
 
     vagas = []
     try:
-        page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        time.sleep(random.uniform(2, 4))
+        navegar(page, plataforma, url, wait_until="domcontentloaded", timeout=30000)
         fechar_popups(page)
 
-        SELETOR = 'div.job_seen_beacon'
-        try:
-            page.wait_for_selector(SELETOR, timeout=10000)
-        except Exception:
+        seletor_usado = encontrar_card(page, plataforma, timeout=10000)
+        if not seletor_usado:
             log(f"   [{plataforma}] ⚠️ Sem cards — salvando debug")
             salvar_debug_html(page, f"debug_{plataforma.lower()}.html")
             return []
 
-        for card in page.locator(SELETOR).all():
-            try:
-                titulo = ""
-                for sel in ['[data-testid="jobTitle"] span', 'h2.jobTitle a span', 'a.jcs-JobTitle span']:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            titulo = el.inner_text(timeout=1500).strip()
-                            if titulo: break
-                    except Exception: pass
-                if not titulo: continue
-
-                empresa = "Não informada"
-                for sel in ['[data-testid="company-name"]', 'span.companyName', '[class*="companyName"]']:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            t = el.inner_text(timeout=1500).strip()
-                            if t: empresa = t; break
-                    except Exception: pass
-
-                local_vaga = CIDADE_UF
-                try:
-                    el = card.locator('[data-testid="text-location"]').first
-                    if el.count():
-                        t = el.inner_text(timeout=1500).strip()
-                        if t: local_vaga = t
-                except Exception: pass
-
-                link = url
-                for sel in ['h2.jobTitle a', 'a.jcs-JobTitle', '[data-testid="jobTitle"] a']:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            href = el.get_attribute("href", timeout=1500)
-                            if href:
-                                link = f"https://br.indeed.com{href}" if href.startswith("/") else href
-                                break
-                    except Exception: pass
-
-                texto = card.inner_text(timeout=2000)
-                vagas.append({
-                    'id':         montar_id(titulo, empresa, plataforma),
-                    'titulo':     titulo,
-                    'empresa':    empresa,
-                    'local':      local_vaga,
-                    'link':       link,
-                    'plataforma': plataforma,
-                    'match_vip':  checar_vip(texto)
-                })
-            except Exception:
-                continue
+        vagas = extrair_pagina(page, plataforma, url, cargo, seletor_usado)
+    except NavegadorCaiu:
+        raise
     except Exception as e:
         log(f"   [{plataforma}] ❌ Erro: {e}")
 
@@ -247,111 +1764,112 @@ def buscar_no_indeed(page, cargo):
 # PLATAFORMA 2 — GUPY
 # URL: portal.gupy.io
 # Usado por: Scania, Mercedes-Benz, VW, grandes indústrias do ABC
-# FIX: SPA React — precisa de networkidle para renderizar os cards
+# O front React busca as vagas em JSON (portal.api.gupy.io); capturamos
+# essa resposta durante a navegação. O DOM só é lido se ela não vier.
 # ================================================================
-def buscar_no_gupy(page, cargo):
+CAPTURAR_JSON_GUPY = True
+TIMEOUT_JSON_GUPY  = 20000   # ms esperando a resposta da API após o commit
+
+def eh_resposta_vagas_gupy(resposta):
+    partes = urllib.parse.urlsplit(resposta.url)
+    return (
+        (partes.hostname or "").endswith("gupy.io")
+        and ("api" in partes.hostname or "/api/" in partes.path)
+        and "job" in partes.path.lower()
+        and resposta.request.resource_type in ("xhr", "fetch")
+        and resposta.ok
+    )
+
+def vagas_do_json_gupy(payload, url):
+    """Monta as vagas a partir do JSON da API de busca do portal."""
+    if isinstance(payload, dict):
+        itens = payload.get('data') or payload.get('jobs') or payload.get('results') or []
+    else:
+        itens = payload or []
+
+    plataforma = "Gupy"
+    vagas = []
+    for item in itens:
+        if not isinstance(item, dict):
+            continue
+        titulo = (item.get('name') or item.get('title') or "").strip()
+        if not titulo:
+            continue
+        empresa = (item.get('careerPageName') or item.get('companyName') or "").strip() or "Não informada"
+        cidade  = ", ".join(p for p in (item.get('city'), item.get('state')) if p)
+        texto   = "\n".join(str(p) for p in (
+            titulo, empresa, cidade, item.get('description'), item.get('workplaceType')
+        ) if p)
+        keywords, score = avaliar_vip(texto)
+        vagas.append({
+            'id':              montar_id(titulo, empresa, plataforma),
+            'titulo':          titulo,
+            'empresa':         empresa,
+            'local':           cidade or CIDADE_UF,
+            'link':            item.get('jobUrl') or url,
+            'plataforma':      plataforma,
+            'match_vip':       score >= SCORE_MIN_VIP,
+            'score_vip':       score,
+            'keywords_vip':    keywords,
+            'data_publicacao': item.get('publishedDate'),
+            'texto':           texto,
+            'captura':         ("json", json.dumps(item, ensure_ascii=False)),
+        })
+    return vagas
+
+def buscar_no_gupy(page, cargo, pagina=1):
     plataforma = "Gupy"
     url = (
         "https://portal.gupy.io/job-search/term"
         f"?term={urllib.parse.quote(cargo)}"
         f"&jobCity={urllib.parse.quote(CIDADE)}"
     )
-    log(f"   [{plataforma}] {cargo}")
+    url = url_da_pagina(url, plataforma, pagina)
+    log(f"   [{plataforma}] {cargo}" + (f" — página {pagina}" if pagina > 1 else ""))
 
     vagas = []
     try:
-        # Gupy é SPA React — usa load + networkidle para aguardar renderização
-        page.goto(url, wait_until="load", timeout=45000)
-        try:
-            page.wait_for_load_state("networkidle", timeout=20000)
-        except Exception:
-            pass  # timeout de networkidle é ok; continua
-        time.sleep(random.uniform(2, 4))
+        if CAPTURAR_JSON_GUPY:
+            payload = None
+            try:
+                # A espera do LIMITADOR fica fora do expect_response: um recuo
+                # longo não pode consumir o TIMEOUT_JSON_GUPY
+                aguardar_vez(plataforma, url)
+                # Para de esperar assim que o JSON chega — sem load/networkidle
+                with etapa("api_json"), \
+                        page.expect_response(eh_resposta_vagas_gupy, timeout=TIMEOUT_JSON_GUPY) as info:
+                    navegar(page, plataforma, url, wait_until="commit", timeout=45000, aguardar=False)
+                payload = info.value.json()
+            except NavegadorCaiu:
+                raise
+            except Exception as e:
+                log(f"   [{plataforma}] ↪ JSON da API não capturado ({type(e).__name__}) — lendo o DOM")
+            if payload is not None:
+                vagas = vagas_do_json_gupy(payload, url)
+                impressao = impressao_de_hrefs(v['link'] for v in vagas)
+                if impressao_repetida(plataforma, url, impressao):
+                    return []
+                guardar_impressao(plataforma, url, impressao, vagas)
+                log(f"   [{plataforma}] {len(vagas)} vagas encontradas (API)")
+                return vagas
+            page.wait_for_load_state("load", timeout=45000)
+        else:
+            navegar(page, plataforma, url, wait_until="load", timeout=45000)
+
+        # Fallback: SPA React — networkidle para aguardar renderização (timeout é ok)
+        aguardar_networkidle(page, timeout=20000)
         fechar_popups(page)
 
-        # Seletores do Gupy (estrutura Styled Components + data-testid)
-        SELETORES_CARD = [
-            '[data-testid="job-card"]',
-            'li[data-testid*="job"]',
-            'div[data-testid*="job"]',
-            'a[data-testid*="job-card"]',
-            'div[class*="JobCard"]',
-            'li[class*="JobCard"]',
-            'div[class*="sc-"][class*="job"]',
-        ]
-        seletor_usado = None
-        for sel in SELETORES_CARD:
-            try:
-                page.wait_for_selector(sel, timeout=6000)
-                if page.locator(sel).count() > 0:
-                    seletor_usado = sel
-                    break
-            except Exception:
-                pass
+        seletor_usado = encontrar_card(page, plataforma, timeout=6000)
 
         if not seletor_usado:
             log(f"   [{plataforma}] ⚠️ Sem cards — salvando debug")
             salvar_debug_html(page, f"debug_{plataforma.lower()}.html")
             return []
 
-        for card in page.locator(seletor_usado).all():
-            try:
-                titulo = ""
-                # Gupy mostra título em h3 ou elemento com data-testid
-                for sel in [
-                    '[data-testid="job-name"]', '[data-testid="job-title"]',
-                    'h3', 'h2', '[class*="jobName"]', '[class*="JobName"]',
-                    '[class*="title"]',
-                ]:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            t = el.inner_text(timeout=1500).strip()
-                            if t and len(t) > 3: titulo = t; break
-                    except Exception: pass
-
-                if not titulo:
-                    # Fallback: primeira linha do texto do card
-                    texto_card = card.inner_text(timeout=2000)
-                    linhas = [l.strip() for l in texto_card.split('\n') if l.strip()]
-                    if linhas: titulo = linhas[0]
-
-                if not titulo: continue
-
-                empresa = "Não informada"
-                for sel in [
-                    '[data-testid="company-name"]', '[data-testid="job-company"]',
-                    '[class*="companyName"]', '[class*="CompanyName"]',
-                    '[class*="company"]', 'span[class*="sc-"]',
-                ]:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            t = el.inner_text(timeout=1500).strip()
-                            if t and t != titulo: empresa = t; break
-                    except Exception: pass
-
-                link = url
-                try:
-                    el = card.locator('a').first
-                    if el.count():
-                        href = el.get_attribute("href", timeout=1500)
-                        if href:
-                            link = f"https://portal.gupy.io{href}" if href.startswith("/") else href
-                except Exception: pass
-
-                texto = card.inner_text(timeout=2000)
-                vagas.append({
-                    'id':         montar_id(titulo, empresa, plataforma),
-                    'titulo':     titulo,
-                    'empresa':    empresa,
-                    'local':      CIDADE_UF,
-                    'link':       link,
-                    'plataforma': plataforma,
-                    'match_vip':  checar_vip(texto)
-                })
-            except Exception:
-                continue
+        vagas = extrair_pagina(page, plataforma, url, cargo, seletor_usado)
+    except NavegadorCaiu:
+        raise
     except Exception as e:
         log(f"   [{plataforma}] ❌ Erro: {e}")
 
@@ -365,7 +1883,7 @@ def buscar_no_gupy(page, cargo):
 # Forte cobertura regional — Grande ABC Paulista
 # FIX: Usar URL de busca com filtro de cidade + checar relevância do título
 # ================================================================
-def buscar_no_vagas(page, cargo):
+def buscar_no_vagas(page, cargo, pagina=1):
     plataforma = "Vagas.com"
 
     # URL de busca com parâmetros (mais preciso que slug)
@@ -374,89 +1892,31 @@ def buscar_no_vagas(page, cargo):
         + cargo.lower().replace(" ", "-")
         + "?filtro_cidade=S%C3%A3o+Bernardo+do+Campo"
     )
-    log(f"   [{plataforma}] {cargo}")
+    url = url_da_pagina(url, plataforma, pagina)
+    log(f"   [{plataforma}] {cargo}" + (f" — página {pagina}" if pagina > 1 else ""))
 
-    # Palavras-chave do cargo para filtrar resultados irrelevantes
-    palavras_cargo = [w.lower() for w in cargo.split() if len(w) > 3]
+    if usar_http(plataforma):
+        vagas = buscar_via_http(plataforma, url, cargo)
+        if vagas is not None:
+            log(f"   [{plataforma}] {len(vagas)} vagas encontradas (HTTP)")
+            return vagas
+        log(f"   [{plataforma}] ↪ HTTP indisponível — usando o navegador")
 
     vagas = []
     try:
-        page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        time.sleep(random.uniform(2, 4))
+        navegar(page, plataforma, url, wait_until="domcontentloaded", timeout=30000)
         fechar_popups(page)
 
-        SELETOR = 'li.vaga'
-        try:
-            page.wait_for_selector(SELETOR, timeout=10000)
-        except Exception:
-            SELETOR = '.opportunity'
-            try:
-                page.wait_for_selector(SELETOR, timeout=5000)
-            except Exception:
-                log(f"   [{plataforma}] ⚠️ Sem cards — salvando debug")
-                salvar_debug_html(page, "debug_vagascom.html")
-                return []
+        seletor_usado = encontrar_card(page, plataforma, timeout=10000)
+        if not seletor_usado:
+            log(f"   [{plataforma}] ⚠️ Sem cards — salvando debug")
+            salvar_debug_html(page, "debug_vagascom.html")
+            return []
 
-        for card in page.locator(SELETOR).all():
-            try:
-                titulo = ""
-                # Vagas.com: título está no h2.cargo (o texto do link ou direto)
-                for sel in ['h2.cargo a', 'h2.cargo', 'a.link-detalhes-vaga', 'h2 a']:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            titulo = el.inner_text(timeout=1500).strip()
-                            if titulo: break
-                    except Exception: pass
-                if not titulo: continue
-
-                # Filtra resultados que não têm relação com o cargo buscado
-                titulo_lower = titulo.lower()
-                if palavras_cargo and not any(p in titulo_lower for p in palavras_cargo):
-                    continue
-
-                empresa = "Confidencial"
-                # Vagas.com: empresa em span.empresa — muitas vezes "Nome Confidencial"
-                for sel in ['span.empresa', 'a.empresa', '.empresa', '[class*="empresa"]']:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            t = el.inner_text(timeout=1500).strip()
-                            if t: empresa = t; break
-                    except Exception: pass
-
-                local_vaga = CIDADE_UF
-                for sel in ['span.localidade', '.localidade', '[class*="localidade"]']:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            t = el.inner_text(timeout=1500).strip()
-                            if t: local_vaga = t; break
-                    except Exception: pass
-
-                link = url
-                for sel in ['h2.cargo a', 'a.link-detalhes-vaga', 'a']:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            href = el.get_attribute("href", timeout=1500)
-                            if href:
-                                link = f"https://www.vagas.com.br{href}" if href.startswith("/") else href
-                                break
-                    except Exception: pass
-
-                texto = card.inner_text(timeout=2000)
-                vagas.append({
-                    'id':         montar_id(titulo, empresa, plataforma),
-                    'titulo':     titulo,
-                    'empresa':    empresa,
-                    'local':      local_vaga,
-                    'link':       link,
-                    'plataforma': plataforma,
-                    'match_vip':  checar_vip(texto)
-                })
-            except Exception:
-                continue
+        # montar_vagas descarta resultados sem relação com o cargo buscado
+        vagas = extrair_pagina(page, plataforma, url, cargo, seletor_usado)
+    except NavegadorCaiu:
+        raise
     except Exception as e:
         log(f"   [{plataforma}] ❌ Erro: {e}")
 
@@ -470,115 +1930,33 @@ def buscar_no_vagas(page, cargo):
 # FIX: timeout aumentado para 60s + networkidle + seletores ampliados
 # Nota: Catho tem anti-bot pesado; se bloquear consistentemente, desativar
 # ================================================================
-def buscar_no_catho(page, cargo):
+def buscar_no_catho(page, cargo, pagina=1):
     plataforma = "Catho"
     url = (
         "https://www.catho.com.br/vagas/"
         f"?q={urllib.parse.quote(cargo)}"
         f"&l={urllib.parse.quote(CIDADE)}"
     )
-    log(f"   [{plataforma}] {cargo}")
+    url = url_da_pagina(url, plataforma, pagina)
+    log(f"   [{plataforma}] {cargo}" + (f" — página {pagina}" if pagina > 1 else ""))
 
     vagas = []
     try:
-        page.goto(url, wait_until="load", timeout=60000)
-        try:
-            page.wait_for_load_state("networkidle", timeout=15000)
-        except Exception:
-            pass
-        time.sleep(random.uniform(4, 7))
+        navegar(page, plataforma, url, wait_until="load", timeout=60000)
+        aguardar_networkidle(page, timeout=15000)
         fechar_popups(page)
 
-        SELETORES_CARD = [
-            '[data-testid="job-card"]',
-            'article[class*="JobCard"]',
-            'div[class*="JobCard"]',
-            'li[class*="job-item"]',
-            'div[class*="job-card"]',
-            '[class*="sc-"][class*="Card"]',
-        ]
-        seletor_usado = None
-        for sel in SELETORES_CARD:
-            try:
-                page.wait_for_selector(sel, timeout=8000)
-                if page.locator(sel).count() > 0:
-                    seletor_usado = sel
-                    break
-            except Exception:
-                pass
+        seletor_usado = encontrar_card(page, plataforma, timeout=8000)
 
         if not seletor_usado:
             log(f"   [{plataforma}] ⚠️ Sem cards — salvando debug")
             salvar_debug_html(page, f"debug_{plataforma.lower()}.html")
             return []
 
-        # Prefixos que indicam página editorial, não vaga real
-        CATHO_EDITORIAL = (
-            "o que o ", "vagas relacionadas", "empregos de ",
-            "o que faz", "salário de ", "como ser ",
-        )
-
-        for card in page.locator(seletor_usado).all():
-            try:
-                titulo = ""
-                for sel in [
-                    '[data-testid="job-title"]',
-                    'h2[class*="Title"] a', 'h3[class*="Title"] a',
-                    'h2 a', 'h3 a', 'h2', 'h3',
-                    'a[class*="title"]', 'a[class*="Title"]',
-                    '[class*="title"]', '[class*="Title"]',
-                ]:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            titulo = el.inner_text(timeout=1500).strip()
-                            if titulo: break
-                    except Exception: pass
-                if not titulo: continue
-
-                # Ignora páginas editoriais do Catho (não são vagas reais)
-                if any(titulo.lower().startswith(p) for p in CATHO_EDITORIAL):
-                    continue
-
-                empresa = "Não informada"
-                for sel in ['[data-testid="company-name"]', '[class*="company"]', '[class*="Company"]']:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            t = el.inner_text(timeout=1500).strip()
-                            if t: empresa = t; break
-                    except Exception: pass
-
-                local_vaga = CIDADE_UF
-                for sel in ['[data-testid="job-location"]', '[class*="location"]', '[class*="Location"]']:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            t = el.inner_text(timeout=1500).strip()
-                            if t: local_vaga = t; break
-                    except Exception: pass
-
-                link = url
-                try:
-                    el = card.locator('a').first
-                    if el.count():
-                        href = el.get_attribute("href", timeout=1500)
-                        if href:
-                            link = f"https://www.catho.com.br{href}" if href.startswith("/") else href
-                except Exception: pass
-
-                texto = card.inner_text(timeout=2000)
-                vagas.append({
-                    'id':         montar_id(titulo, empresa, plataforma),
-                    'titulo':     titulo,
-                    'empresa':    empresa,
-                    'local':      local_vaga,
-                    'link':       link,
-                    'plataforma': plataforma,
-                    'match_vip':  checar_vip(texto)
-                })
-            except Exception:
-                continue
+        # montar_vagas ignora páginas editoriais do Catho (não são vagas reais)
+        vagas = extrair_pagina(page, plataforma, url, cargo, seletor_usado)
+    except NavegadorCaiu:
+        raise
     except Exception as e:
         log(f"   [{plataforma}] ❌ Erro: {e}")
 
@@ -591,7 +1969,7 @@ def buscar_no_catho(page, cargo):
 # URL: infojobs.com.br
 # FIX: URL corrigida — InfoJobs BR usa /empregos/ (sem .aspx no path atual)
 # ================================================================
-def buscar_no_infojobs(page, cargo):
+def buscar_no_infojobs(page, cargo, pagina=1):
     plataforma = "InfoJobs"
 
     slug = cargo.lower().replace(" ", "-")
@@ -603,40 +1981,22 @@ def buscar_no_infojobs(page, cargo):
         "&normalizedProvince=sao-paulo&city=sao-bernardo-do-campo"
         "&normalizedCity=sao-bernardo-do-campo"
     )
-    log(f"   [{plataforma}] {cargo}")
+    url_principal   = url_da_pagina(url_principal, plataforma, pagina)
+    url_alternativa = url_da_pagina(url_alternativa, plataforma, pagina)
+    log(f"   [{plataforma}] {cargo}" + (f" — página {pagina}" if pagina > 1 else ""))
 
-    vagas = []
+    seletor_usado = None
     for url in [url_principal, url_alternativa]:
         try:
-            page.goto(url, wait_until="load", timeout=40000)
-            try:
-                page.wait_for_load_state("networkidle", timeout=12000)
-            except Exception:
-                pass
-            time.sleep(random.uniform(2, 4))
+            navegar(page, plataforma, url, wait_until="load", timeout=40000)
+            aguardar_networkidle(page, timeout=12000)
             fechar_popups(page)
 
-            SELETORES_CARD = [
-                'li.ij-OfferCardBasic',
-                'li[class*="OfferCard"]',
-                'li[class*="offer"]',
-                'div[class*="OfferCard"]',
-                '.boxVaga',
-                'li.boxVaga',
-                '[class*="offer-item"]',
-            ]
-            seletor_usado = None
-            for sel in SELETORES_CARD:
-                try:
-                    page.wait_for_selector(sel, timeout=6000)
-                    if page.locator(sel).count() > 0:
-                        seletor_usado = sel
-                        break
-                except Exception:
-                    pass
-
+            seletor_usado = encontrar_card(page, plataforma, timeout=6000)
             if seletor_usado:
                 break  # Encontrou cards, sai do loop de URLs
+        except NavegadorCaiu:
+            raise
         except Exception as e:
             log(f"   [{plataforma}] ⚠️ URL falhou: {e}")
             continue
@@ -646,64 +2006,13 @@ def buscar_no_infojobs(page, cargo):
         salvar_debug_html(page, f"debug_{plataforma.lower()}.html")
         return []
 
-    for card in page.locator(seletor_usado).all():
-        try:
-            titulo = ""
-            for sel in [
-                'h2 a', 'h3 a', 'a[class*="Title"]', 'a[class*="title"]',
-                '[class*="title"] a', '[class*="tituloVaga"] a',
-                '.tituloVaga a', '.ic1_titulo a',
-            ]:
-                try:
-                    el = card.locator(sel).first
-                    if el.count():
-                        titulo = el.inner_text(timeout=1500).strip()
-                        if titulo: break
-                except Exception: pass
-            if not titulo: continue
-
-            empresa = "Não informada"
-            for sel in [
-                '[class*="company"]', '[class*="Company"]',
-                '[class*="empresa"]', '.nomeEmpresa', 'span[class*="Employer"]',
-            ]:
-                try:
-                    el = card.locator(sel).first
-                    if el.count():
-                        t = el.inner_text(timeout=1500).strip()
-                        if t: empresa = t; break
-                except Exception: pass
-
-            local_vaga = CIDADE_UF
-            for sel in ['[class*="location"]', '[class*="cidade"]', '[class*="city"]', '.localVaga']:
-                try:
-                    el = card.locator(sel).first
-                    if el.count():
-                        t = el.inner_text(timeout=1500).strip()
-                        if t: local_vaga = t; break
-                except Exception: pass
-
-            link = url
-            try:
-                el = card.locator('a').first
-                if el.count():
-                    href = el.get_attribute("href", timeout=1500)
-                    if href:
-                        link = f"https://www.infojobs.com.br{href}" if href.startswith("/") else href
-            except Exception: pass
-
-            texto = card.inner_text(timeout=2000)
-            vagas.append({
-                'id':         montar_id(titulo, empresa, plataforma),
-                'titulo':     titulo,
-                'empresa':    empresa,
-                'local':      local_vaga,
-                'link':       link,
-                'plataforma': plataforma,
-                'match_vip':  checar_vip(texto)
-            })
-        except Exception:
-            continue
+    vagas = []
+    try:
+        vagas = extrair_pagina(page, plataforma, url, cargo, seletor_usado)
+    except NavegadorCaiu:
+        raise
+    except Exception as e:
+        log(f"   [{plataforma}] ❌ Erro: {e}")
 
     log(f"   [{plataforma}] {len(vagas)} vagas encontradas")
     return vagas
@@ -714,90 +2023,31 @@ def buscar_no_infojobs(page, cargo):
 # URL: sine.com.br
 # FIX: URL corrigida — empregabrasil.mte.gov.br não resolve mais
 # ================================================================
-def buscar_no_sine(page, cargo):
+def buscar_no_sine(page, cargo, pagina=1):
     plataforma = "SINE"
     slug_cargo  = cargo.lower().replace(" ", "-")
     url = (
         f"https://www.sine.com.br/vagas-emprego-em-sao-bernardo-do-campo-sp"
         f"/{slug_cargo}"
     )
-    log(f"   [{plataforma}] {cargo}")
+    url = url_da_pagina(url, plataforma, pagina)
+    log(f"   [{plataforma}] {cargo}" + (f" — página {pagina}" if pagina > 1 else ""))
 
     vagas = []
     try:
-        page.goto(url, wait_until="domcontentloaded", timeout=30000)
-        time.sleep(random.uniform(2, 4))
+        navegar(page, plataforma, url, wait_until="domcontentloaded", timeout=30000)
         fechar_popups(page)
 
-        # sine.com.br usa cards com classe .vaga-lista ou similar
-        SELETORES_CARD = [
-            'li.vaga-lista', 'li[class*="vaga"]',
-            'div[class*="vaga-item"]', 'article[class*="vaga"]',
-            '.resultado-vaga', 'li.resultado',
-            '.vaga',
-        ]
-        seletor_usado = None
-        for sel in SELETORES_CARD:
-            try:
-                page.wait_for_selector(sel, timeout=8000)
-                if page.locator(sel).count() > 0:
-                    seletor_usado = sel
-                    break
-            except Exception:
-                pass
+        seletor_usado = encontrar_card(page, plataforma, timeout=8000)
 
         if not seletor_usado:
             log(f"   [{plataforma}] ⚠️ Sem cards — salvando debug")
             salvar_debug_html(page, f"debug_{plataforma.lower()}.html")
             return []
 
-        for card in page.locator(seletor_usado).all():
-            try:
-                titulo = ""
-                for sel in ['h2 a', 'h3 a', 'a[class*="title"]', 'a[class*="cargo"]', 'a']:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            t = el.inner_text(timeout=1500).strip()
-                            if t and len(t) > 3: titulo = t; break
-                    except Exception: pass
-
-                if not titulo:
-                    texto_card = card.inner_text(timeout=2000)
-                    linhas = [l.strip() for l in texto_card.split('\n') if l.strip()]
-                    if linhas: titulo = linhas[0]
-                if not titulo: continue
-
-                empresa = "Não informada"
-                for sel in ['[class*="empresa"]', '[class*="company"]', 'span[class*="nome"]']:
-                    try:
-                        el = card.locator(sel).first
-                        if el.count():
-                            t = el.inner_text(timeout=1500).strip()
-                            if t: empresa = t; break
-                    except Exception: pass
-
-                link = url
-                try:
-                    el = card.locator('a').first
-                    if el.count():
-                        href = el.get_attribute("href", timeout=1500)
-                        if href:
-                            link = f"https://www.sine.com.br{href}" if href.startswith("/") else href
-                except Exception: pass
-
-                texto = card.inner_text(timeout=2000)
-                vagas.append({
-                    'id':         montar_id(titulo, empresa, plataforma),
-                    'titulo':     titulo,
-                    'empresa':    empresa,
-                    'local':      CIDADE_UF,
-                    'link':       link,
-                    'plataforma': plataforma,
-                    'match_vip':  checar_vip(texto)
-                })
-            except Exception:
-                continue
+        vagas = extrair_pagina(page, plataforma, url, cargo, seletor_usado)
+    except NavegadorCaiu:
+        raise
     except Exception as e:
         log(f"   [{plataforma}] ❌ Erro: {e}")
 
@@ -805,6 +2055,85 @@ def buscar_no_sine(page, cargo):
     return vagas
 
 
+# ================================================================
+# BLOQUEIO DE RECURSOS (context.route)
+# Só passam documentos, scripts, CSS e XHR/fetch; imagens, fontes, mídia
+# e qualquer coisa dos domínios de rastreamento/anúncio são abortadas.
+# Menos tráfego = networkidle resolve bem antes (Gupy e Catho).
+# ================================================================
+BLOQUEAR_RECURSOS = True
+
+TIPOS_PERMITIDOS = {"document", "script", "stylesheet", "xhr", "fetch"}
+
+DOMINIOS_RASTREIO = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "googleadservices.com", "fundingchoicesmessages.google.com",
+    "facebook.net", "facebook.com", "hotjar.com", "clarity.ms", "licdn.com",
+    "criteo.com", "rubiconproject.com", "pubmatic.com", "adnxs.com", "teads.tv",
+    "4dex.io", "refinery89.com", "3lift.com", "aticdn.net", "denakop.com",
+    "fulllab.com.br", "hubspot.com", "hs-analytics.net", "hsadspixel.net",
+    "hs-banner.com", "usemessages.com", "cloudflareinsights.com", "debugbear.com",
+    "nobeta.com.br", "handtalk.me", "tiktok.com", "taboola.com", "amazon-adsystem.com",
+]
+
+# Ajustes por plataforma (chaves ausentes herdam o padrão acima)
+POLITICA_RECURSOS = {
+    # Resultados vêm no HTML; o XHR da página é leilão de anúncio (prebid)
+    "Vagas.com": {'tipos': TIPOS_PERMITIDOS - {"xhr", "fetch"}},
+}
+
+# Tamanho médio por tipo — a requisição abortada não revela o tamanho real
+BYTES_ESTIMADOS = {
+    "image": 35_000, "font": 45_000, "media": 400_000,
+    "script": 60_000, "stylesheet": 20_000,
+}
+
+def politica_de_recursos(plataforma):
+    ajuste = POLITICA_RECURSOS.get(plataforma, {})
+    return {
+        'tipos':     ajuste.get('tipos', TIPOS_PERMITIDOS),
+        'bloquear':  DOMINIOS_RASTREIO + ajuste.get('bloquear_dominios', []),
+        'permitir':  ajuste.get('permitir_dominios', []),
+    }
+
+def _host_em(host, dominios):
+    return any(host == d or host.endswith("." + d) for d in dominios)
+
+def _navegacao_principal(req):
+    """A própria página de resultados — iframes (anúncios, rastreadores) não contam."""
+    try:
+        return req.is_navigation_request() and req.frame.parent_frame is None
+    except Exception:   # requisições de service worker não têm frame
+        return False
+
+def instalar_bloqueio(context, plataforma, economia=None):
+    """Registra o filtro no contexto e retorna o contador de economia (atualizado ao vivo).
+
+    Passar o contador de um contexto anterior continua a contagem nele.
+    """
+    if economia is None:
+        economia = {'requisicoes': 0, 'bytes': 0, 'por_tipo': {}}
+    if not BLOQUEAR_RECURSOS:
+        return economia
+    politica = politica_de_recursos(plataforma)
+
+    def rotear(route):
+        req  = route.request
+        tipo = req.resource_type
+        host = urllib.parse.urlsplit(req.url).hostname or ""
+        if not _navegacao_principal(req) and not _host_em(host, politica['permitir']) and (
+                tipo not in politica['tipos'] or _host_em(host, politica['bloquear'])):
+            economia['requisicoes'] += 1
+            economia['bytes'] += BYTES_ESTIMADOS.get(tipo, 5_000)
+            economia['por_tipo'][tipo] = economia['por_tipo'].get(tipo, 0) + 1
+            route.abort("blockedbyclient")
+        else:
+            route.continue_()
+
+    context.route("**/*", rotear)
+    return economia
+
+
 # ================================================================
 # ORQUESTRADOR PRINCIPAL
 # ================================================================
@@ -821,70 +2150,378 @@ PLATAFORMAS = [
 ]
 
 
+def nome_da_plataforma(fn_plataforma):
+    return fn_plataforma.__name__.replace("buscar_no_", "").replace("_", " ").title()
+
+def plataforma_da_funcao(fn_plataforma):
+    """buscar_no_vagas → 'Vagas.com' (chave usada em SELETORES)."""
+    sufixo = fn_plataforma.__name__.replace("buscar_no_", "")
+    return next(
+        (p for p in SELETORES if p.split(".")[0].lower() == sufixo),
+        nome_da_plataforma(fn_plataforma)
+    )
+
+
+def abrir_navegador(p):
+    browser = p.chromium.launch(
+        headless=False,
+        args=["--start-maximized", "--disable-blink-features=AutomationControlled"]
+    )
+    return browser
+
+# ── Sessão persistida ──
+# Cookies e localStorage de cada plataforma são salvos ao fim de uma
+# varredura bem-sucedida e restaurados no próximo contexto: o consentimento
+# de cookies já vem dado e a sessão "quente" dispara menos desafios anti-bot.
+ESTADO_SESSAO = "estado_{}.json"
+
+def arquivo_estado(plataforma):
+    return ESTADO_SESSAO.format(plataforma.lower().replace(".", ""))
+
+def recuos_da_plataforma(plataforma):
+    return sum(h['recuos'] for h in LIMITADOR.resumo(plataforma).values())
+
+def sessao_confiavel(plataforma, recuos_antes, encontrou_cards):
+    """Só vale salvar a sessão de uma varredura que achou cards e não levou bloqueio/captcha."""
+    return encontrou_cards and recuos_da_plataforma(plataforma) == recuos_antes
+
+def salvar_estado(context, plataforma):
+    caminho = arquivo_estado(plataforma)
+    try:
+        # grava em arquivo temporário para não deixar um JSON truncado
+        # (um por processo: no modo multiprocesso a plataforma pode estar em vários)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        context.storage_state(path=temporario)
+        os.replace(temporario, caminho)
+    except Exception as e:
+        log(f"   [{plataforma}] ⚠️ Não foi possível salvar a sessão: {e}")
+
+def novo_contexto(browser, plataforma=None):
+    caminho = arquivo_estado(plataforma) if plataforma else None
+    estado  = caminho if caminho and os.path.exists(caminho) else None
+    try:
+        context = _criar_contexto(browser, estado)
+    except Exception as e:
+        # estado corrompido/incompatível: começa do zero
+        log(f"   [{plataforma}] ⚠️ Sessão salva ignorada ({e})")
+        context = _criar_contexto(browser, None)
+    return context
+
+def _criar_contexto(browser, estado):
+    context = browser.new_context(
+        viewport={'width': 1366, 'height': 768},
+        user_agent=USER_AGENT,
+        locale="pt-BR",
+        storage_state=estado
+    )
+    context.add_init_script(
+        "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+    )
+    return context
+
+def preparar_contexto(browser, plataforma, economia=None):
+    """Contexto (com a sessão salva) + bloqueio de recursos + página: (context, page, economia)."""
+    context  = novo_contexto(browser, plataforma)
+    economia = instalar_bloqueio(context, plataforma, economia)
+    return context, context.new_page(), economia
+
+def abrir_sessao(p, plataforma, economia=None):
+    """Browser novo já com contexto e página: (browser, context, page, economia)."""
+    with etapa("abrir_navegador"):
+        browser = abrir_navegador(p)
+        context, page, economia = preparar_contexto(browser, plataforma, economia)
+    return browser, context, page, economia
+
+def reabrir_sessao(p, plataforma, browser, economia, erro):
+    """Troca um browser que caiu por um novo (a contagem de economia continua)."""
+    log(f"   [{plataforma}] ♻️ Navegador caiu ({erro}) — reabrindo")
+    with contextlib.suppress(Exception):
+        browser.close()
+    return abrir_sessao(p, plataforma, economia)
+
+def mensagem_vagas(plataforma, vagas):
+    return {
+        'vagas':      vagas,
+        'impressoes': coletar_impressoes(plataforma),
+        'etapas':     coletar_etapas(plataforma),
+    }
+
+def mensagem_fim(plataforma, economia):
+    """Estatísticas que um worker envia ao terminar (mensagem "fim")."""
+    return {
+        'economia': economia,
+        'ritmo':    LIMITADOR.resumo(plataforma),
+        'acertos':  coletar_acertos(plataforma),
+        'popups':   coletar_popups(plataforma),
+        'paginas':  contagem_impressoes(plataforma),
+        'etapas':   coletar_etapas(plataforma),
+    }
+
+
+def executar_plataforma(fn_plataforma, cargos, fila):
+    """Worker de uma plataforma: browser, contexto e página próprios.
+
+    Percorre os cargos em série (mantendo as pausas de cortesia do site) e
+    envia cada lista de vagas para a fila — quem grava no banco é o
+    orquestrador. Sempre termina com uma mensagem "fim" com as
+    estatísticas do worker.
+    """
+    nome = plataforma_da_funcao(fn_plataforma)
+    economia = None
+    try:
+        # Cada thread precisa da sua própria instância do Playwright (API sync)
+        definir_contexto(nome)
+        reativar_http(nome)
+        with sync_playwright() as p:
+            browser, context, page, economia = abrir_sessao(p, nome)
+            recuos_antes, encontrou = recuos_da_plataforma(nome), False
+            # O intervalo entre buscas é controlado por navegar()/LIMITADOR
+            for cargo in cargos:
+                definir_contexto(nome, cargo)
+                try:
+                    vagas = paginar(nome, cargo, lambda pagina: fn_plataforma(page, cargo, pagina))
+                except NavegadorCaiu as e:
+                    browser, context, page, economia = reabrir_sessao(p, nome, browser, economia, e)
+                    vagas = []
+                encontrou = encontrou or bool(vagas)
+                fila.put(("vagas", nome, cargo, mensagem_vagas(nome, vagas)))
+            if sessao_confiavel(nome, recuos_antes, encontrou):
+                salvar_estado(context, nome)
+            browser.close()
+    except Exception as e:
+        log(f"   [{nome}] ❌ Erro no worker: {e}")
+    finally:
+        fila.put(("fim", nome, None, mensagem_fim(nome, economia)))
+
+
+# ── Modo multiprocesso ──
+# Com PROCESSOS > 0 os pares (plataforma, cargo) são repartidos entre N
+# processos, cada um com seus navegadores (uma thread por plataforma dentro
+# do processo). Uma plataforma pode estar em vários processos: o ritmo por
+# host vem de um LIMITADOR compartilhado (GerenteRitmo), então mais
+# processos cobrem mais cargos no mesmo tempo sem passar do RITMO. Os
+# processos só enviam resultados pela fila; o banco e o relatório ficam com
+# o orquestrador.
+PROCESSOS = 0   # 0 = uma thread por plataforma no próprio processo
+ESPERA_FILA_S = 5   # de quanto em quanto tempo o orquestrador confere workers mortos
+
+def exportar_estado():
+    """Estado carregado do banco que os processos worker precisam enxergar."""
+    return {
+        'ids':         set(IDS_CONHECIDOS),
+        'varreduras':  dict(ULTIMAS_VARREDURAS),
+        'impressoes':  dict(IMPRESSOES),
+        'ordem':       ORDEM_SELETORES,
+        'demovidos':   DEMOVIDOS,
+    }
+
+def importar_estado(estado):
+    IDS_CONHECIDOS.update(estado['ids'])
+    ULTIMAS_VARREDURAS.update(estado['varreduras'])
+    IMPRESSOES.update(estado['impressoes'])
+    ORDEM_SELETORES.update(estado['ordem'])
+    DEMOVIDOS.update(estado['demovidos'])
+
+def fatiar_tarefas(n):
+    """Reparte os pares (nome da função, cargo) em até n fatias."""
+    # Cargo por cargo: cada fatia recebe uma mistura de plataformas
+    tarefas = [(fn.__name__, cargo) for cargo in CARGOS for fn in PLATAFORMAS]
+    return [fatia for fatia in (tarefas[i::n] for i in range(n)) if fatia]
+
+def iniciar_threads(tarefas, fila):
+    """Uma thread por plataforma, cada uma com seus cargos: { plataforma: thread }."""
+    threads = {}
+    for fn_plataforma, cargos in tarefas.items():
+        nome_plataforma = plataforma_da_funcao(fn_plataforma)
+        log(f">>> PLATAFORMA: {nome_plataforma} ({len(cargos)} cargos)")
+        t = threading.Thread(
+            target=executar_plataforma, args=(fn_plataforma, cargos, fila),
+            name=nome_plataforma, daemon=True
+        )
+        t.start()
+        threads[nome_plataforma] = t
+    return threads
+
+def executar_fatia(fatia, fila, estado, limitador):
+    """Processo worker: roda as plataformas da sua fatia em paralelo (threads)."""
+    global LIMITADOR
+    LIMITADOR = limitador
+    importar_estado(estado)
+    tarefas = {}
+    for nome_fn, cargo in fatia:
+        tarefas.setdefault(globals()[nome_fn], []).append(cargo)
+    for t in iniciar_threads(tarefas, fila).values():
+        t.join()
+
+def mesclar_estatisticas(atual, novo):
+    """Junta os dados de mensagens "fim" da mesma plataforma (vários processos)."""
+    if not atual:
+        return novo
+    economia_a, economia_n = atual.get('economia'), novo.get('economia')
+    if economia_a and economia_n:
+        economia_a['requisicoes'] += economia_n['requisicoes']
+        economia_a['bytes'] += economia_n['bytes']
+        for tipo, n in economia_n['por_tipo'].items():
+            economia_a['por_tipo'][tipo] = economia_a['por_tipo'].get(tipo, 0) + n
+    else:
+        atual['economia'] = economia_a or economia_n
+    # 'ritmo' não se soma: é o mesmo LIMITADOR; buscar_vagas relê no fim
+    for chave, (acertos, tentativas) in novo['acertos'].items():
+        a = atual['acertos'].setdefault(chave, [0, 0])
+        a[0] += acertos
+        a[1] += tentativas
+    for k in ('iguais', 'diferentes'):
+        atual['paginas'][k] += novo['paginas'][k]
+    for padrao, vezes in novo['popups'].items():
+        atual['popups'][padrao] = atual['popups'].get(padrao, 0) + vezes
+    return atual
+
+def iniciar_workers(fila_threads):
+    """Dispara os workers.
+
+    Retorna (fila, pendentes, gerente): pendentes = { plataforma: [worker
+    por mensagem "fim" esperada] }; gerente é o GerenteRitmo (ou None), cujo
+    LIMITADOR passa a ser também o deste processo.
+    """
+    global LIMITADOR
+    if PROCESSOS > 0:
+        # spawn: processos limpos, sem herdar o estado do Playwright/threads do pai
+        ctx     = multiprocessing.get_context("spawn")
+        fila    = ctx.Queue()
+        gerente = GerenteRitmo(ctx=ctx)
+        gerente.start()
+        limitador = LIMITADOR = LimitadorCompartilhado(gerente.Limitador())
+        estado  = exportar_estado()
+        fatias  = fatiar_tarefas(PROCESSOS)
+        pendentes = {}
+        for i, fatia in enumerate(fatias):
+            proc = ctx.Process(target=executar_fatia, args=(fatia, fila, estado, limitador),
+                               name=f"worker-{i + 1}", daemon=True)
+            proc.start()
+            for nome_fn in dict.fromkeys(nome_fn for nome_fn, _ in fatia):
+                pendentes.setdefault(plataforma_da_funcao(globals()[nome_fn]), []).append(proc)
+        log(f">>> {len(fatias)} processos | {len(pendentes)} plataformas | "
+            f"{sum(len(f) for f in fatias)} buscas")
+        return fila, pendentes, gerente
+
+    # Uma thread por plataforma: os sites são independentes, então o tempo
+    # total cai para o da plataforma mais lenta.
+    threads = iniciar_threads({fn: CARGOS for fn in PLATAFORMAS}, fila_threads)
+    return fila_threads, {nome: [t] for nome, t in threads.items()}, None
+
+def descartar_mortos(pendentes):
+    """Tira de `pendentes` as plataformas sem nenhum worker vivo (morreram sem mandar "fim")."""
+    for nome_plataforma, workers in list(pendentes.items()):
+        if any(w.is_alive() for w in workers):
+            continue
+        codigos = sorted({w.exitcode for w in workers if getattr(w, "exitcode", None) is not None})
+        log(f"   [{nome_plataforma}] ❌ Worker encerrou sem concluir"
+            + (f" (código de saída {', '.join(map(str, codigos))})" if codigos else ""))
+        del pendentes[nome_plataforma]
+
+
+def carregar_estado(conn):
+    """Carrega do banco o que os workers consultam durante a varredura."""
+    IDS_CONHECIDOS.clear()
+    IDS_CONHECIDOS.update(carregar_ids(conn))
+    ULTIMAS_VARREDURAS.clear()
+    ULTIMAS_VARREDURAS.update(carregar_ultimas_varreduras(conn))
+    IMPRESSOES.clear()
+    IMPRESSOES.update(carregar_impressoes(conn))
+    carregar_ordem_seletores(conn)
+
+def processar_vagas(conn, run_id, nome_plataforma, cargo, dados, inicio_varredura):
+    """Grava uma mensagem "vagas" de um worker e devolve as vagas realmente novas."""
+    with etapa("db", nome_plataforma, cargo):
+        registrar_varredura(conn, nome_plataforma, cargo, inicio_varredura)
+        salvas = salvar_lote(conn, dados['vagas'], IDS_CONHECIDOS, MAX_VAGAS_CARGO)
+    for vaga in salvas:
+        if vaga['promoveu_vip']:
+            log(f"   🔥 VIP (outra fonte da mesma vaga): {vaga['titulo']} | {vaga['empresa']}")
+            continue
+        if vaga['repetida']:
+            log(f"   🔁 Já vista em outra fonte: {vaga['titulo']} | {vaga['empresa']}")
+            continue
+        prefixo = "🔥 VIP" if vaga['match_vip'] else "✅ Nova"
+        log(f"   {prefixo}: {vaga['titulo']} | {vaga['empresa']}")
+    # Só memoriza a página se nada dela ficou de fora (ex.: MAX_VAGAS_CARGO)
+    completas = [
+        (url, impressao) for url, impressao, ids in dados['impressoes']
+        if all(i in IDS_CONHECIDOS for i in ids)
+    ]
+    salvar_impressoes(conn, completas)
+    salvar_etapas(conn, run_id, dados['etapas'] + coletar_etapas(nome_plataforma))
+    # No modo daemon os workers seguem rodando: a próxima passada já enxerga isto
+    IMPRESSOES.update(completas)
+    ULTIMAS_VARREDURAS[(nome_plataforma, cargo)] = inicio_varredura
+    # Repetidas ficam no banco (mais uma fonte da vaga), mas não contam nem
+    # notificam — exceto quando tornam VIP uma vaga que não era
+    return [vaga for vaga in salvas if not vaga['repetida'] or vaga['promoveu_vip']]
+
 def buscar_vagas():
     log("=" * 60)
     log("=== RASTREADOR DE VAGAS — FAGNER PEÇANHA ===")
     log(f"=== {len(PLATAFORMAS)} plataformas | {len(CARGOS)} cargos | Últimos 7 dias ===")
     log("=" * 60)
-    init_db()
+    conn = abrir_db()
+    init_db(conn)
+    carregar_estado(conn)
+    inicio_varredura = datetime.datetime.now()
+    run_id = iniciar_run(conn, inicio_varredura)
 
     novas_total = 0
     novas_vip   = 0
     resumo      = {}  # { plataforma: { 'novas': int, 'vip': int } }
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=False,
-            args=["--start-maximized", "--disable-blink-features=AutomationControlled"]
-        )
-        context = browser.new_context(
-            viewport={'width': 1366, 'height': 768},
-            user_agent=(
-                "Mozilla/5.0 (X11; Linux x86_64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/121.0.0.0 Safari/537.36"
-            ),
-            locale="pt-BR"
-        )
-        context.add_init_script(
-            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-        )
-        page = context.new_page()
-
-        # Itera: plataforma → cargo
-        for fn_plataforma in PLATAFORMAS:
-            nome_plataforma = fn_plataforma.__name__.replace("buscar_no_", "").replace("_", " ").title()
-            log(f"\n{'─'*60}")
-            log(f">>> PLATAFORMA: {nome_plataforma}")
-            log(f"{'─'*60}")
-
-            resumo[nome_plataforma] = {'novas': 0, 'vip': 0}
-
-            for cargo in CARGOS:
-                vagas = fn_plataforma(page, cargo)
+    for fn_plataforma in PLATAFORMAS:
+        resumo[plataforma_da_funcao(fn_plataforma)] = {'novas': 0, 'vip': 0}
 
-                count = 0
-                for vaga in vagas:
-                    if count >= MAX_VAGAS_CARGO:
-                        break
-                    if not vaga_existe(vaga['id']):
-                        if salvar_vaga(vaga):
-                            novas_total += 1
-                            resumo[nome_plataforma]['novas'] += 1
-                            if vaga['match_vip']:
-                                novas_vip += 1
-                                resumo[nome_plataforma]['vip'] += 1
-                            prefixo = "🔥 VIP" if vaga['match_vip'] else "✅ Nova"
-                            log(f"   {prefixo}: {vaga['titulo']} | {vaga['empresa']}")
-                            count += 1
-
-                # Pausa entre cargos (comportamento humano)
-                time.sleep(random.uniform(3, 6))
-
-            # Pausa maior entre plataformas
-            time.sleep(random.uniform(4, 7))
-
-        browser.close()
+    # Workers (threads ou processos) só buscam; o banco só é tocado aqui.
+    global LIMITADOR
+    limitador_local = LIMITADOR
+    fila, pendentes, gerente = iniciar_workers(queue.Queue())
+    workers = {w for ws in pendentes.values() for w in ws}
+    estatisticas = {}  # { plataforma: dados das mensagens "fim" (mescladas) }
+    while pendentes:
+        try:
+            tipo, nome_plataforma, cargo, dados = fila.get(timeout=ESPERA_FILA_S)
+        except queue.Empty:
+            # Processo morto (OOM, kill, Chromium) nunca manda "fim": não esperar por ele
+            descartar_mortos(pendentes)
+            continue
+        if tipo == "fim":
+            if nome_plataforma in pendentes:
+                pendentes[nome_plataforma].pop()
+                if not pendentes[nome_plataforma]:
+                    del pendentes[nome_plataforma]
+            salvar_etapas(conn, run_id, dados.pop('etapas'))
+            salvar_popups(conn, nome_plataforma, dados['popups'])
+            estatisticas[nome_plataforma] = mesclar_estatisticas(estatisticas.get(nome_plataforma), dados)
+            log(f"   [{nome_plataforma}] ✔ Worker concluído")
+            continue
+        for vaga in processar_vagas(conn, run_id, nome_plataforma, cargo, dados, inicio_varredura):
+            novas_total += 1
+            resumo[nome_plataforma]['novas'] += 1
+            if vaga['match_vip']:
+                novas_vip += 1
+                resumo[nome_plataforma]['vip'] += 1
+
+    for w in workers:
+        w.join()
+    # Ritmo lido no fim, direto do LIMITADOR: com processos ele é compartilhado
+    # e cada "fim" traria o mesmo host contado de novo
+    for nome_plataforma, dados in estatisticas.items():
+        dados['ritmo'] = LIMITADOR.resumo(nome_plataforma)
+    if gerente:
+        gerente.shutdown()
+        LIMITADOR = limitador_local
+
+    acertos = {}
+    for dados in estatisticas.values():
+        acertos.update((dados or {}).get('acertos') or {})
+    salvar_estatisticas_seletores(conn, acertos, [plataforma_da_funcao(fn) for fn in PLATAFORMAS])
+    finalizar_run(conn, run_id, inicio_varredura, novas_total, novas_vip)
+    conn.close()
 
     # ── RELATÓRIO FINAL ──
     log(f"\n{'='*60}")
@@ -894,6 +2531,34 @@ def buscar_vagas():
         log(f"  {plataforma:15s} → {dados['novas']:3d} novas  |  {dados['vip']:3d} VIP 🔥")
     log(f"{'─'*60}")
     log(f"  TOTAL          → {novas_total:3d} novas  |  {novas_vip:3d} VIP 🔥")
+    log(f"{'─'*60}")
+    log("  PÁGINAS INALTERADAS (impressão digital: iguais | diferentes)")
+    iguais = diferentes = 0
+    for plataforma, dados in estatisticas.items():
+        paginas = (dados or {}).get('paginas') or {'iguais': 0, 'diferentes': 0}
+        iguais, diferentes = iguais + paginas['iguais'], diferentes + paginas['diferentes']
+        log(f"  {plataforma:15s} → {paginas['iguais']:3d} puladas  |  {paginas['diferentes']:3d} extraídas")
+    log(f"  TOTAL          → {iguais:3d} puladas  |  {diferentes:3d} extraídas")
+    log(f"{'─'*60}")
+    log("  RECURSOS BLOQUEADOS (bytes estimados)")
+    for plataforma, dados in estatisticas.items():
+        economia = (dados or {}).get('economia')
+        if economia:
+            tipos = ", ".join(f"{t}={n}" for t, n in sorted(economia['por_tipo'].items()))
+            log(f"  {plataforma:15s} → {economia['requisicoes']:5d} req  |  "
+                f"~{economia['bytes'] / 1_048_576:6.1f} MB  ({tipos})")
+    log(f"{'─'*60}")
+    log("  POPUPS VISTOS (padrão × vezes)")
+    for plataforma, dados in estatisticas.items():
+        popups = (dados or {}).get('popups') or {}
+        vistos = ", ".join(f"{p}×{n}" for p, n in sorted(popups.items())) or "nenhum"
+        log(f"  {plataforma:15s} → {vistos}")
+    log(f"{'─'*60}")
+    log("  RITMO POR HOST (intervalo final | esperas | recuos)")
+    for plataforma, dados in estatisticas.items():
+        for host, r in ((dados or {}).get('ritmo') or {}).items():
+            log(f"  {host:28s} → {r['intervalo']:5.1f} s/req  |  "
+                f"{r['espera_total']:6.0f} s em {r['requisicoes']} req  |  {r['recuos']} recuos")
     log(f"{'='*60}")
 
     if novas_total > 0:
@@ -902,5 +2567,189 @@ def buscar_vagas():
         log("Nenhuma vaga nova encontrada nesta varredura.")
 
 
+# ================================================================
+# MODO DAEMON — navegador e banco quentes, agenda interna
+# ================================================================
+# Intervalo entre varreduras de cada plataforma (segundos). Plataformas que
+# rendem mais VIP são consultadas com mais frequência.
+INTERVALO_DAEMON = {
+    "Gupy":      30 * 60,
+    "Indeed":    30 * 60,
+    "Vagas.com": 60 * 60,
+    "InfoJobs":  2 * 3600,
+    "Catho":     2 * 3600,
+    "SINE":      6 * 3600,
+}
+INTERVALO_DAEMON_PADRAO = 60 * 60
+RECICLAR_CONTEXTO_APOS  = 12   # passadas; descarta memória/cache (a sessão volta de ESTADO_SESSAO)
+ESPERA_REINICIO_S       = 60   # antes de reabrir um worker que caiu
+
+PARAR = threading.Event()   # setado por SIGTERM/SIGINT
+
+
+def executar_plataforma_daemon(fn_plataforma, cargos, fila, atraso=0):
+    """Worker do daemon: mantém o browser aberto e repete a varredura no intervalo da plataforma.
+
+    Cada passada é delimitada por "inicio" e "ciclo"; ao receber PARAR o
+    worker termina o cargo atual, fecha o browser e envia "fim". Se o
+    browser cair (NavegadorCaiu), ele é reaberto antes do próximo cargo.
+    `atraso` adia a abertura quando o worker é reiniciado.
+    """
+    nome      = plataforma_da_funcao(fn_plataforma)
+    intervalo = INTERVALO_DAEMON.get(nome, INTERVALO_DAEMON_PADRAO)
+    economia  = None
+    try:
+        definir_contexto(nome)
+        if PARAR.wait(atraso):
+            return
+        with sync_playwright() as p:
+            browser, context, page, economia = abrir_sessao(p, nome)
+            passadas = 0
+            while not PARAR.is_set():
+                if passadas and passadas % RECICLAR_CONTEXTO_APOS == 0:
+                    with etapa("reciclar_contexto"):
+                        context.close()
+                        context, page, economia = preparar_contexto(browser, nome, economia)
+                reativar_http(nome)
+                recuos_antes, encontrou = recuos_da_plataforma(nome), False
+                fila.put(("inicio", nome, None, {'quando': datetime.datetime.now()}))
+                for cargo in cargos:
+                    if PARAR.is_set():
+                        break
+                    definir_contexto(nome, cargo)
+                    try:
+                        vagas = paginar(nome, cargo, lambda pagina: fn_plataforma(page, cargo, pagina))
+                    except NavegadorCaiu as e:
+                        browser, context, page, economia = reabrir_sessao(p, nome, browser, economia, e)
+                        vagas = []
+                    except Exception as e:
+                        # Um cargo com erro não derruba o daemon
+                        log(f"   [{nome}] ❌ Erro em '{cargo}': {e}")
+                        vagas = []
+                    encontrou = encontrou or bool(vagas)
+                    fila.put(("vagas", nome, cargo, mensagem_vagas(nome, vagas)))
+                definir_contexto(nome)
+                if sessao_confiavel(nome, recuos_antes, encontrou):
+                    salvar_estado(context, nome)
+                passadas += 1
+                fila.put(("ciclo", nome, None, {
+                    'acertos': coletar_acertos(nome),
+                    'popups':  coletar_popups(nome),
+                    'paginas': contagem_impressoes(nome),
+                    'etapas':  coletar_etapas(nome),
+                }))
+                if not PARAR.is_set():
+                    log(f"   [{nome}] 💤 Próxima varredura em {intervalo // 60} min")
+                PARAR.wait(intervalo)
+            browser.close()
+    except Exception as e:
+        log(f"   [{nome}] ❌ Erro no worker: {e}")
+    finally:
+        fila.put(("fim", nome, None, mensagem_fim(nome, economia)))
+
+def iniciar_worker_daemon(fn_plataforma, fila, atraso=0):
+    t = threading.Thread(
+        target=executar_plataforma_daemon, args=(fn_plataforma, CARGOS, fila, atraso),
+        name=plataforma_da_funcao(fn_plataforma), daemon=True
+    )
+    t.start()
+    return t
+
+
+def _pedir_parada(signum, frame):
+    if not PARAR.is_set():
+        log(f"\n>>> Sinal {signum} recebido — encerrando após o cargo atual...")
+    PARAR.set()
+
+def daemon():
+    """Roda indefinidamente: uma thread por plataforma, cada uma no seu intervalo.
+
+    Cada passada de uma plataforma vira uma linha em `runs`.
+    """
+    log("=" * 60)
+    log("=== RASTREADOR DE VAGAS — MODO DAEMON ===")
+    for fn_plataforma in PLATAFORMAS:
+        nome = plataforma_da_funcao(fn_plataforma)
+        log(f"=== {nome:10s} a cada {INTERVALO_DAEMON.get(nome, INTERVALO_DAEMON_PADRAO) // 60} min")
+    log("=" * 60)
+    signal.signal(signal.SIGTERM, _pedir_parada)
+    signal.signal(signal.SIGINT, _pedir_parada)
+
+    conn = abrir_db()
+    init_db(conn)
+    carregar_estado(conn)
+
+    fila = queue.Queue()
+    funcoes = {plataforma_da_funcao(fn): fn for fn in PLATAFORMAS}
+    workers = [iniciar_worker_daemon(fn_plataforma, fila) for fn_plataforma in PLATAFORMAS]
+
+    passadas = {}  # { plataforma: {'run_id', 'inicio', 'novas', 'vip'} }
+    ativos   = len(workers)
+    while ativos:
+        tipo, nome_plataforma, cargo, dados = fila.get()
+        if tipo == "inicio":
+            passadas[nome_plataforma] = {
+                'run_id': iniciar_run(conn, dados['quando'], plataformas=1),
+                'inicio': dados['quando'], 'novas': 0, 'vip': 0,
+            }
+            continue
+        passada = passadas.get(nome_plataforma)
+        if tipo == "vagas":
+            for vaga in processar_vagas(conn, passada['run_id'], nome_plataforma, cargo,
+                                        dados, passada['inicio']):
+                passada['novas'] += 1
+                passada['vip'] += int(vaga['match_vip'])
+            continue
+
+        # "ciclo" fecha a passada; "fim" fecha o worker (e a passada, se houver)
+        salvar_popups(conn, nome_plataforma, dados['popups'])
+        if passada:
+            salvar_etapas(conn, passada['run_id'], dados['etapas'])
+            salvar_estatisticas_seletores(conn, dados['acertos'], [nome_plataforma])
+            # A próxima passada já usa a ordem de seletores aprendida nesta
+            carregar_ordem_seletores(conn)
+            finalizar_run(conn, passada['run_id'], passada['inicio'], passada['novas'], passada['vip'])
+            del passadas[nome_plataforma]
+            paginas = dados['paginas']
+            log(f"   [{nome_plataforma}] ✔ Passada concluída: {passada['novas']} novas | "
+                f"{passada['vip']} VIP | {paginas['iguais']} páginas inalteradas")
+            if passada['novas'] > 0:
+                notificar(passada['novas'], passada['vip'])
+        if tipo == "fim":
+            if not PARAR.is_set():
+                # O worker caiu sozinho: volta depois de uma pausa
+                log(f"   [{nome_plataforma}] ⚠️ Worker caiu — reiniciando em {ESPERA_REINICIO_S} s")
+                workers.append(iniciar_worker_daemon(funcoes[nome_plataforma], fila, ESPERA_REINICIO_S))
+                continue
+            ativos -= 1
+            log(f"   [{nome_plataforma}] ✔ Worker encerrado")
+
+    for w in workers:
+        w.join()
+    conn.close()
+    log(">>> Daemon encerrado.")
+
+
 if __name__ == "__main__":
-    buscar_vagas()
+    args = sys.argv[1:]
+
+    if "--replay" in args:
+        # python rastreador.py --replay debug_gupy.html debug_catho.html
+        replay([a for a in args if not a.startswith("--")])
+    elif "--rescore" in args:
+        # python rastreador.py --rescore   (depois de mudar KEYWORDS_VIP/PESOS_VIP)
+        rescore()
+    elif "--daemon" in args:
+        # python rastreador.py --daemon   (SIGTERM/Ctrl+C encerra com calma)
+        daemon()
+    else:
+        if "--processos" in args:
+            # python rastreador.py --processos 4
+            try:
+                PROCESSOS = int(args[args.index("--processos") + 1])
+            except (IndexError, ValueError):
+                PROCESSOS = -1
+            if PROCESSOS < 0:
+                print("Uso: python rastreador.py --processos N   (N >= 0; 0 = só threads)")
+                sys.exit(2)
+        buscar_vagas()
@@ -2,77 +2,250 @@ import sqlite3
 import datetime
 import os
 import sys
-import pandas as pd
+import csv
+import html
+import itertools
+import collections
+import base64
+import json
+import hashlib
+import email.utils
+import http.server
+import urllib.parse
 
 DB_NAME   = "vagas.db"
 HTML_FILE = "vagas_exportadas.html"
+CSV_FILE  = "vagas_exportadas.csv"
+TAMANHO_LOTE = 1000   # linhas lidas do cursor por vez nas exportações
 
 # ================================================================
 # QUERY BASE
 # ================================================================
-QUERY_COMPLETA = """
-SELECT
-    titulo      as 'Cargo',
-    empresa     as 'Empresa',
-    local       as 'Local',
-    COALESCE(plataforma, '') as 'Fonte',
-    link        as 'Link',
-    match_vip   as 'VIP',
-    datetime(data_encontrada, 'localtime') as 'Encontrada em'
-FROM vagas
-ORDER BY match_vip DESC, data_encontrada DESC
+# Uma linha por vaga real: só a primeira vaga de cada cluster (cluster_id = id),
+# com as fontes das duplicadas ao lado e o VIP do cluster (vip_cluster: o
+# maior entre as fontes). A ordem vem pronta do índice parcial
+# idx_vagas_canonicas_vip, e as fontes saem de idx_vagas_cluster — nada de
+# ordenar a tabela inteira a cada consulta.
+COLUNAS_LISTA = """
+    v.titulo    as 'Cargo',
+    v.empresa   as 'Empresa',
+    v.local     as 'Local',
+    COALESCE((SELECT REPLACE(GROUP_CONCAT(DISTINCT d.plataforma), ',', ', ')
+              FROM vagas d WHERE d.cluster_id = v.id), '') as 'Fonte',
+    v.link      as 'Link',
+    (SELECT GROUP_CONCAT(d.link, ' ') FROM vagas d WHERE d.cluster_id = v.id) as 'Links',
+    v.vip_cluster as 'VIP',
+    datetime(v.data_encontrada, 'localtime') as 'Encontrada em'
+"""
+
+QUERY_COMPLETA = f"""
+SELECT {COLUNAS_LISTA}
+FROM vagas v
+WHERE v.cluster_id = v.id
+ORDER BY v.vip_cluster DESC, v.data_encontrada DESC
 """
 
 
-def get_vagas(limit=100):
-    conn = sqlite3.connect(DB_NAME)
+# Versão do banco (PRAGMA user_version) com o que estas consultas usam
+# (cluster_id, vip_cluster, texto/FTS, alteracoes). Quem migra é o rastreador.py.
+ESQUEMA_MINIMO = 8
+
+def versao_esquema():
+    """user_version do banco, ou None se ele ainda não existe."""
+    if not os.path.exists(DB_NAME):
+        return None
+    conn = sqlite3.connect(f"file:{DB_NAME}?mode=ro", uri=True)
     try:
-        df = pd.read_sql_query(QUERY_COMPLETA + f"LIMIT {limit}", conn)
-        return df
+        return conn.execute("PRAGMA user_version").fetchone()[0]
     finally:
         conn.close()
 
+def abrir_leitura():
+    conn = sqlite3.connect(DB_NAME)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def contar_vagas(conn):
+    """(total, vip) das vagas da lista — conta direto no índice parcial."""
+    total, vip = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(vip_cluster), 0) FROM vagas WHERE cluster_id = id"
+    ).fetchone()
+    return total, int(vip)
+
+def iterar_vagas(conn, limite=None):
+    """Linhas de QUERY_COMPLETA em lotes de TAMANHO_LOTE, sem carregar tudo na memória."""
+    cursor = conn.execute(QUERY_COMPLETA + (f"LIMIT {int(limite)}" if limite else ""))
+    while True:
+        lote = cursor.fetchmany(TAMANHO_LOTE)
+        if not lote:
+            return
+        yield from lote
+
+
+# ================================================================
+# MODELO HTML (tema escuro) — usado pela exportação
+# ================================================================
+ESTILO_HTML = """
+  * { box-sizing: border-box; margin: 0; padding: 0; }
+  body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+         background: #0f172a; color: #e2e8f0; padding: 24px; }
+  h1   { font-size: 1.5rem; color: #f8fafc; margin-bottom: 4px; }
+  .sub { color: #94a3b8; font-size: 0.9rem; margin-bottom: 24px; }
+  .stats { display: flex; gap: 16px; margin-bottom: 20px; }
+  .stat { background: #1e293b; border-radius: 8px; padding: 12px 20px;
+           border: 1px solid #334155; }
+  .stat .num { font-size: 1.6rem; font-weight: 700; color: #38bdf8; }
+  .stat .label { font-size: 0.75rem; color: #94a3b8; text-transform: uppercase; }
+  .stat.vip-stat .num { color: #f97316; }
+  table  { width: 100%; border-collapse: collapse; background: #1e293b;
+            border-radius: 10px; overflow: hidden; }
+  thead  { background: #0f172a; }
+  th     { padding: 12px 14px; text-align: left; font-size: 0.75rem;
+            color: #94a3b8; text-transform: uppercase; letter-spacing: 0.05em; }
+  td     { padding: 11px 14px; font-size: 0.875rem; border-bottom: 1px solid #1e3a5f20; }
+  tr:hover td { background: #263348; }
+  tr.vip td  { background: #1c1407; border-left: 3px solid #f97316; }
+  tr.vip:hover td { background: #2a1d0a; }
+  .badge { background: #f97316; color: #fff; font-size: 0.65rem; font-weight: 700;
+            padding: 2px 6px; border-radius: 4px; margin-right: 4px;
+            text-transform: uppercase; vertical-align: middle; }
+  a      { color: #38bdf8; text-decoration: none; }
+  a:hover { text-decoration: underline; }
+  .fonte { background: #1e3a5f; color: #7dd3fc; font-size: 0.75rem;
+            padding: 2px 8px; border-radius: 12px; white-space: nowrap; }
+  .btn-candidatar { background: #0284c7; color: #fff !important; padding: 5px 12px;
+                     border-radius: 6px; font-size: 0.8rem; white-space: nowrap; }
+  .btn-candidatar:hover { background: #0369a1; text-decoration: none !important; }
+  footer { text-align: center; margin-top: 20px; color: #475569; font-size: 0.8rem; }
+"""
+
+CABECALHO_TABELA_HTML = """<table>
+  <thead>
+    <tr>
+      <th>Cargo</th>
+      <th>Empresa</th>
+      <th>Local</th>
+      <th>Fonte</th>
+      <th>Encontrada em</th>
+      <th>Ação</th>
+    </tr>
+  </thead>
+  <tbody>
+"""
+
+INICIO_HTML = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="UTF-8">
+<meta name="viewport" content="width=device-width, initial-scale=1.0">
+<title>Vagas — Fagner Peçanha</title>
+<style>{estilo}</style>
+</head>
+<body>
+<h1>Rastreador de Vagas — Fagner Peçanha</h1>
+<p class="sub">São Bernardo do Campo, SP &nbsp;·&nbsp; Gerado em {gerado_em}</p>
+
+<div class="stats">
+  <div class="stat">
+    <div class="num">{total}</div>
+    <div class="label">Vagas encontradas</div>
+  </div>
+  <div class="stat vip-stat">
+    <div class="num">{vip_count}</div>
+    <div class="label">Vagas VIP</div>
+  </div>
+</div>
+
+"""
+
+FIM_HTML = """  </tbody>
+</table>
+<footer>Gerado automaticamente · python ver_vagas.py --exportar</footer>
+</body>
+</html>
+"""
+
+LINHA_HTML = """
+        <tr{vip_class}>
+            <td>{vip_badge}<a href="{link}" target="_blank">{cargo}</a></td>
+            <td>{empresa}</td>
+            <td>{local}</td>
+            <td><span class="fonte">{fonte}</span></td>
+            <td>{encontrada}</td>
+            <td><a href="{link}" target="_blank" class="btn-candidatar">Candidatar</a></td>
+        </tr>"""
+
+
+def linha_html(row):
+    e = html.escape
+    return LINHA_HTML.format(
+        vip_class  = ' class="vip"' if row['VIP'] else '',
+        vip_badge  = '<span class="badge">VIP</span> ' if row['VIP'] else '',
+        link       = e(row['Link'] or "#"),
+        cargo      = e(row['Cargo'] or ""),
+        empresa    = e(row['Empresa'] or "Confidencial"),
+        local      = e(row['Local'] or "—"),
+        fonte      = e(row['Fonte'] or "—"),
+        encontrada = e(row['Encontrada em'] or "—"),
+    )
+
 
 # ================================================================
 # MODO 1 — Tabela resumida no terminal (padrão)
 # ================================================================
+def formatar_tabela(linhas, colunas, largura_max=45):
+    """Tabela alinhada por coluna (textos longos cortados com '…')."""
+    def corta(valor):
+        texto = "" if valor is None else str(valor)
+        return texto if len(texto) <= largura_max else texto[:largura_max - 1] + "…"
+    celulas  = [[corta(v) for v in linha] for linha in linhas]
+    larguras = [max([len(c)] + [len(l[i]) for l in celulas]) for i, c in enumerate(colunas)]
+    saida = ["  ".join(c.ljust(w) for c, w in zip(colunas, larguras)).rstrip()]
+    saida += ["  ".join(v.ljust(w) for v, w in zip(l, larguras)).rstrip() for l in celulas]
+    return "\n".join(saida)
+
 def mostrar_relatorio():
-    df = get_vagas(50)
+    conn = abrir_leitura()
+    try:
+        vagas = list(iterar_vagas(conn, 50))
+    finally:
+        conn.close()
 
-    if df.empty:
+    if not vagas:
         print("\n Nenhuma vaga encontrada no banco de dados ainda.")
         print("Execute: python rastreador.py")
         return
 
-    total     = len(df)
-    vip_count = df['VIP'].sum()
+    total     = len(vagas)
+    vip_count = sum(1 for v in vagas if v['VIP'])
 
     print("\n" + "=" * 80)
     print(f"  RASTREADOR DE VAGAS — FAGNER PEÇANHA  |  {total} vagas  |  {vip_count} VIP")
     print("=" * 80)
 
-    df_exibir = df[['Cargo', 'Empresa', 'Local', 'Fonte', 'Encontrada em']].copy()
-    df_exibir.insert(0, '', df['VIP'].apply(lambda x: '>> VIP' if x else ''))
-
-    pd.set_option('display.max_rows', None)
-    pd.set_option('display.max_columns', None)
-    pd.set_option('display.width', 220)
-    pd.set_option('display.max_colwidth', 45)
-    print(df_exibir.to_string(index=False))
+    colunas = ['Cargo', 'Empresa', 'Local', 'Fonte', 'Encontrada em']
+    print(formatar_tabela(
+        [['>> VIP' if v['VIP'] else ''] + [v[c] for c in colunas] for v in vagas],
+        [''] + colunas
+    ))
 
     print("\n" + "─" * 80)
 
-    if df['Fonte'].str.strip().any():
+    resumo = collections.Counter(
+        fonte for v in vagas for fonte in (v['Fonte'] or "").split(", ") if fonte
+    )
+    if resumo:
         print("\n  VAGAS POR PLATAFORMA:")
-        resumo = df.groupby('Fonte').size().sort_values(ascending=False)
-        for fonte, qtd in resumo.items():
-            if fonte:
-                print(f"    {fonte:15s} -> {qtd} vagas")
+        for fonte, qtd in resumo.most_common():
+            print(f"    {fonte:15s} -> {qtd} vagas")
 
     print("\n  COMANDOS DISPONÍVEIS:")
     print("  python ver_vagas.py --links      → lista com links no terminal")
     print("  python ver_vagas.py --exportar   → gera vagas_exportadas.html (clicável)")
     print("  python ver_vagas.py --csv        → gera vagas_exportadas.csv (planilha)")
+    print("  python ver_vagas.py --stats      → tempo por fase (p50/p95) das últimas varreduras")
+    print('  python ver_vagas.py --buscar "WMS AND SAP" → busca no texto das vagas')
+    print("  python ver_vagas.py --serve      → painel local em http://127.0.0.1:8765/")
     print("=" * 80 + "\n")
 
 
@@ -80,26 +253,29 @@ def mostrar_relatorio():
 # MODO 2 — Links no terminal
 # ================================================================
 def mostrar_com_links():
-    df = get_vagas(50)
-
-    if df.empty:
-        print("\n Nenhuma vaga no banco ainda. Execute: python rastreador.py")
-        return
-
-    total     = len(df)
-    vip_count = df['VIP'].sum()
-
-    print("\n" + "=" * 80)
-    print(f"  VAGAS COM LINKS  |  {total} vagas  |  {vip_count} VIP")
-    print("=" * 80)
-
-    for _, row in df.iterrows():
-        vip = "  [VIP]" if row['VIP'] else ""
-        print(f"\n  {row['Cargo']}{vip}")
-        print(f"  Empresa : {row['Empresa']}")
-        print(f"  Fonte   : {row['Fonte']}")
-        print(f"  Link    : {row['Link']}")
-        print("  " + "─" * 60)
+    conn = abrir_leitura()
+    try:
+        total, vip_count = contar_vagas(conn)
+        if not total:
+            print("\n Nenhuma vaga no banco ainda. Execute: python rastreador.py")
+            return
+
+        print("\n" + "=" * 80)
+        print(f"  VAGAS COM LINKS  |  {total} vagas  |  {vip_count} VIP")
+        print("=" * 80)
+
+        for row in iterar_vagas(conn):
+            vip = "  [VIP]" if row['VIP'] else ""
+            print(f"\n  {row['Cargo']}{vip}")
+            print(f"  Empresa : {row['Empresa']}")
+            print(f"  Fonte   : {row['Fonte']}")
+            print(f"  Link    : {row['Link']}")
+            for outro in (row['Links'] or "").split():
+                if outro != row['Link']:
+                    print(f"            {outro}")
+            print("  " + "─" * 60)
+    finally:
+        conn.close()
 
     print(f"\n  Total: {total} vagas  |  Para exportar: python ver_vagas.py --exportar\n")
 
@@ -108,112 +284,25 @@ def mostrar_com_links():
 # MODO 3 — Exportar HTML com links clicáveis
 # ================================================================
 def exportar_html():
-    df = get_vagas(200)
-
-    if df.empty:
-        print("\n Nenhuma vaga no banco. Execute: python rastreador.py")
-        return
-
-    total     = len(df)
-    vip_count = int(df['VIP'].sum())
-    gerado_em = datetime.datetime.now().strftime("%d/%m/%Y %H:%M")
-
-    linhas_html = ""
-    for _, row in df.iterrows():
-        vip_class  = ' class="vip"' if row['VIP'] else ''
-        vip_badge  = '<span class="badge">VIP</span> ' if row['VIP'] else ''
-        empresa    = row['Empresa'] if row['Empresa'] else "Confidencial"
-        fonte      = row['Fonte']   if row['Fonte']   else "—"
-        local      = row['Local']   if row['Local']   else "—"
-        link       = row['Link']    if row['Link']    else "#"
-        encontrada = row['Encontrada em'] if row['Encontrada em'] else "—"
-
-        linhas_html += f"""
-        <tr{vip_class}>
-            <td>{vip_badge}<a href="{link}" target="_blank">{row['Cargo']}</a></td>
-            <td>{empresa}</td>
-            <td>{local}</td>
-            <td><span class="fonte">{fonte}</span></td>
-            <td>{encontrada}</td>
-            <td><a href="{link}" target="_blank" class="btn-candidatar">Candidatar</a></td>
-        </tr>"""
-
-    html = f"""<!DOCTYPE html>
-<html lang="pt-BR">
-<head>
-<meta charset="UTF-8">
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<title>Vagas — Fagner Peçanha</title>
-<style>
-  * {{ box-sizing: border-box; margin: 0; padding: 0; }}
-  body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-         background: #0f172a; color: #e2e8f0; padding: 24px; }}
-  h1   {{ font-size: 1.5rem; color: #f8fafc; margin-bottom: 4px; }}
-  .sub {{ color: #94a3b8; font-size: 0.9rem; margin-bottom: 24px; }}
-  .stats {{ display: flex; gap: 16px; margin-bottom: 20px; }}
-  .stat {{ background: #1e293b; border-radius: 8px; padding: 12px 20px;
-           border: 1px solid #334155; }}
-  .stat .num {{ font-size: 1.6rem; font-weight: 700; color: #38bdf8; }}
-  .stat .label {{ font-size: 0.75rem; color: #94a3b8; text-transform: uppercase; }}
-  .stat.vip-stat .num {{ color: #f97316; }}
-  table  {{ width: 100%; border-collapse: collapse; background: #1e293b;
-            border-radius: 10px; overflow: hidden; }}
-  thead  {{ background: #0f172a; }}
-  th     {{ padding: 12px 14px; text-align: left; font-size: 0.75rem;
-            color: #94a3b8; text-transform: uppercase; letter-spacing: 0.05em; }}
-  td     {{ padding: 11px 14px; font-size: 0.875rem; border-bottom: 1px solid #1e3a5f20; }}
-  tr:hover td {{ background: #263348; }}
-  tr.vip td  {{ background: #1c1407; border-left: 3px solid #f97316; }}
-  tr.vip:hover td {{ background: #2a1d0a; }}
-  .badge {{ background: #f97316; color: #fff; font-size: 0.65rem; font-weight: 700;
-            padding: 2px 6px; border-radius: 4px; margin-right: 4px;
-            text-transform: uppercase; vertical-align: middle; }}
-  a      {{ color: #38bdf8; text-decoration: none; }}
-  a:hover {{ text-decoration: underline; }}
-  .fonte {{ background: #1e3a5f; color: #7dd3fc; font-size: 0.75rem;
-            padding: 2px 8px; border-radius: 12px; white-space: nowrap; }}
-  .btn-candidatar {{ background: #0284c7; color: #fff !important; padding: 5px 12px;
-                     border-radius: 6px; font-size: 0.8rem; white-space: nowrap; }}
-  .btn-candidatar:hover {{ background: #0369a1; text-decoration: none !important; }}
-  footer {{ text-align: center; margin-top: 20px; color: #475569; font-size: 0.8rem; }}
-</style>
-</head>
-<body>
-<h1>Rastreador de Vagas — Fagner Peçanha</h1>
-<p class="sub">São Bernardo do Campo, SP &nbsp;·&nbsp; Gerado em {gerado_em}</p>
-
-<div class="stats">
-  <div class="stat">
-    <div class="num">{total}</div>
-    <div class="label">Vagas encontradas</div>
-  </div>
-  <div class="stat vip-stat">
-    <div class="num">{vip_count}</div>
-    <div class="label">Vagas VIP</div>
-  </div>
-</div>
-
-<table>
-  <thead>
-    <tr>
-      <th>Cargo</th>
-      <th>Empresa</th>
-      <th>Local</th>
-      <th>Fonte</th>
-      <th>Encontrada em</th>
-      <th>Ação</th>
-    </tr>
-  </thead>
-  <tbody>
-    {linhas_html}
-  </tbody>
-</table>
-<footer>Gerado automaticamente · python ver_vagas.py --exportar</footer>
-</body>
-</html>"""
-
-    with open(HTML_FILE, "w", encoding="utf-8") as f:
-        f.write(html)
+    conn = abrir_leitura()
+    try:
+        total, vip_count = contar_vagas(conn)
+        if not total:
+            print("\n Nenhuma vaga no banco. Execute: python rastreador.py")
+            return
+
+        gerado_em = datetime.datetime.now().strftime("%d/%m/%Y %H:%M")
+        # Escreve em lotes direto no arquivo: memória constante, sem LIMIT
+        with open(HTML_FILE, "w", encoding="utf-8") as f:
+            f.write(INICIO_HTML.format(estilo=ESTILO_HTML, gerado_em=gerado_em,
+                                       total=total, vip_count=vip_count))
+            f.write(CABECALHO_TABELA_HTML)
+            linhas = map(linha_html, iterar_vagas(conn))
+            while lote := list(itertools.islice(linhas, TAMANHO_LOTE)):
+                f.write("".join(lote))
+            f.write(FIM_HTML)
+    finally:
+        conn.close()
 
     caminho = os.path.abspath(HTML_FILE)
     print(f"\n  HTML gerado com sucesso!")
@@ -227,23 +316,378 @@ def exportar_html():
 # MODO 4 — Exportar CSV (planilha)
 # ================================================================
 def exportar_csv():
-    df = get_vagas(200)
-
-    if df.empty:
-        print("\n Nenhuma vaga no banco. Execute: python rastreador.py")
-        return
-
-    csv_file = "vagas_exportadas.csv"
-    df_csv = df[['Cargo', 'Empresa', 'Local', 'Fonte', 'Link', 'VIP', 'Encontrada em']].copy()
-    df_csv['VIP'] = df_csv['VIP'].apply(lambda x: 'SIM' if x else '')
-    df_csv.to_csv(csv_file, index=False, encoding='utf-8-sig')  # utf-8-sig para Excel/LibreOffice
+    conn = abrir_leitura()
+    try:
+        total, _ = contar_vagas(conn)
+        if not total:
+            print("\n Nenhuma vaga no banco. Execute: python rastreador.py")
+            return
+
+        colunas = ['Cargo', 'Empresa', 'Local', 'Fonte', 'Link', 'VIP', 'Encontrada em']
+        # utf-8-sig para Excel/LibreOffice
+        with open(CSV_FILE, "w", encoding="utf-8-sig", newline="") as f:
+            escritor = csv.writer(f)
+            escritor.writerow(colunas)
+            escritor.writerows(
+                [row[c] for c in colunas[:5]] + ['SIM' if row['VIP'] else '', row['Encontrada em']]
+                for row in iterar_vagas(conn)
+            )
+    finally:
+        conn.close()
 
-    caminho = os.path.abspath(csv_file)
+    caminho = os.path.abspath(CSV_FILE)
     print(f"\n  CSV gerado!")
     print(f"  Arquivo : {caminho}")
-    print(f"  Vagas   : {len(df_csv)}")
+    print(f"  Vagas   : {total}")
     print(f"\n  Abra com:")
-    print(f"  libreoffice --calc {csv_file}\n")
+    print(f"  libreoffice --calc {CSV_FILE}\n")
+
+
+# ================================================================
+# MODO 5 — Tempo por fase (runs / run_steps)
+# ================================================================
+def mostrar_stats(ultimas=10):
+    # pandas só aqui: os outros modos abrem instantâneo sem ele
+    import pandas as pd
+
+    conn = sqlite3.connect(DB_NAME)
+    try:
+        runs = pd.read_sql_query(
+            "SELECT id, inicio, duracao_s, novas, vip FROM runs ORDER BY id DESC LIMIT ?",
+            conn, params=(ultimas,)
+        )
+        etapas = pd.read_sql_query('''
+            SELECT plataforma, fase, duracao_ms FROM run_steps
+            WHERE run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)
+        ''', conn, params=(ultimas,))
+    except Exception:
+        print("\n Nenhuma medição no banco ainda. Execute: python rastreador.py")
+        return
+    finally:
+        conn.close()
+
+    if etapas.empty:
+        print("\n Nenhuma medição no banco ainda. Execute: python rastreador.py")
+        return
+
+    def p50(x): return x.quantile(0.50) / 1000
+    def p95(x): return x.quantile(0.95) / 1000
+    def total(x): return x.sum() / 1000
+
+    print("\n" + "=" * 80)
+    print(f"  TEMPO POR FASE  |  últimas {len(runs)} varreduras  |  {len(etapas)} etapas medidas")
+    print("=" * 80)
+
+    print("\n  VARREDURAS:")
+    for _, run in runs.iterrows():
+        duracao = f"{run['duracao_s'] / 60:6.1f} min" if pd.notna(run['duracao_s']) else "  (incompleta)"
+        print(f"    #{run['id']:<5d} {run['inicio'][:16]}  {duracao}  |  "
+              f"{run['novas'] if pd.notna(run['novas']) else 0:.0f} novas")
+
+    por_fase = (etapas.groupby('fase')['duracao_ms']
+                .agg(n='count', p50_s=p50, p95_s=p95, total_s=total)
+                .sort_values('total_s', ascending=False))
+    print("\n  POR FASE (segundos):")
+    print(por_fase.round(2).to_string())
+
+    por_plataforma = (etapas.groupby(['plataforma', 'fase'])['duracao_ms']
+                      .agg(n='count', p50_s=p50, p95_s=p95, total_s=total)
+                      .sort_values(['plataforma', 'total_s'], ascending=[True, False]))
+    print("\n  POR PLATAFORMA E FASE (segundos):")
+    pd.set_option('display.max_rows', None)
+    print(por_plataforma.round(2).to_string())
+    print("=" * 80 + "\n")
+
+
+# ================================================================
+# MODO 6 — Busca textual (FTS5)
+# ================================================================
+# Ranking bm25 com peso maior para título, depois empresa, depois o texto do card.
+QUERY_BUSCA = """
+SELECT
+    v.titulo, v.empresa, v.plataforma, v.link,
+    COALESCE(c.vip_cluster, v.match_vip) AS match_vip,
+    COALESCE(v.cluster_id, v.id) AS cluster,
+    datetime(v.data_encontrada, 'localtime') AS encontrada,
+    snippet(vagas_fts, 2, ?, ?, '…', 14) AS trecho
+FROM vagas_fts
+JOIN vagas v ON v.rowid = vagas_fts.rowid
+LEFT JOIN vagas c ON c.id = v.cluster_id
+WHERE vagas_fts MATCH ?
+ORDER BY bm25(vagas_fts, 10.0, 4.0, 1.0)
+LIMIT ?
+"""
+
+def buscar(consulta, limite=30):
+    # Destaque em amarelo no terminal; entre colchetes se a saída for arquivo/pipe
+    marca = ("\033[1;33m", "\033[0m") if sys.stdout.isatty() else ("[", "]")
+    conn = abrir_leitura()
+    try:
+        linhas = conn.execute(QUERY_BUSCA, (*marca, consulta, limite * 3)).fetchall()
+    except sqlite3.OperationalError as e:
+        print(f"\n Busca inválida ({e}). Exemplos: WMS AND SAP | \"supply chain\" | logist*")
+        return
+    finally:
+        conn.close()
+
+    # Uma linha por vaga real: as outras fontes do mesmo cluster são puladas
+    vistos, resultado = set(), []
+    for row in linhas:
+        if row['cluster'] not in vistos:
+            vistos.add(row['cluster'])
+            resultado.append(row)
+    resultado = resultado[:limite]
+
+    print("\n" + "=" * 80)
+    print(f"  BUSCA: {consulta}  |  {len(resultado)} resultados")
+    print("=" * 80)
+    if not resultado:
+        print("\n  Nada encontrado.\n")
+        return
+    for row in resultado:
+        vip = "  [VIP]" if row['match_vip'] else ""
+        print(f"\n  {row['titulo']}{vip}")
+        print(f"  {row['empresa']}  ·  {row['plataforma']}  ·  {row['encontrada']}")
+        if row['trecho']:
+            print(f"  {' '.join(row['trecho'].split())}")
+        print(f"  {row['link']}")
+        print("  " + "─" * 60)
+    print()
+
+
+# ================================================================
+# MODO 7 — Painel local (python ver_vagas.py --serve)
+# ================================================================
+# Servidor HTTP só de leitura direto no banco: a página usa o mesmo tema e
+# a mesma marcação de linha da exportação e busca as vagas em
+# /api/vagas, paginadas por (data_encontrada, id) — cada página é uma
+# busca no índice, não importa quão fundo no histórico.
+PORTA_PADRAO   = 8765
+LIMITE_PAGINA  = 50
+LIMITE_MAXIMO  = 500
+
+ESTILO_PAINEL = """
+  form.filtros { display: flex; gap: 12px; align-items: center; margin-bottom: 16px;
+                 color: #94a3b8; font-size: 0.85rem; }
+  form.filtros select, form.filtros input { background: #1e293b; color: #e2e8f0;
+                 border: 1px solid #334155; border-radius: 6px; padding: 5px 8px; }
+  #mais { display: block; margin: 16px auto; }
+"""
+
+FILTROS_PAINEL = """<form class="filtros" id="filtros">
+  <label>Fonte <select name="plataforma"><option value="">Todas</option>{opcoes}</select></label>
+  <label><input type="checkbox" name="vip" value="1"> Só VIP</label>
+  <label>De <input type="date" name="desde"></label>
+  <label>Até <input type="date" name="ate"></label>
+</form>
+
+"""
+
+SCRIPT_PAINEL = """
+<button id="mais" class="btn-candidatar">Carregar mais</button>
+<script>
+const corpo = document.querySelector('tbody'), mais = document.getElementById('mais'),
+      filtros = document.getElementById('filtros');
+let cursor = null;
+async function carregar(reiniciar) {
+  const params = new URLSearchParams(new FormData(filtros));
+  for (const [k, v] of [...params]) if (!v) params.delete(k);
+  if (reiniciar) { cursor = null; corpo.innerHTML = ''; }
+  if (cursor) params.set('cursor', cursor);
+  const resposta = await fetch('/api/vagas?' + params);
+  const dados = await resposta.json();
+  corpo.insertAdjacentHTML('beforeend', dados.html);
+  cursor = dados.proximo;
+  mais.style.display = cursor ? '' : 'none';
+}
+filtros.addEventListener('change', () => carregar(true));
+mais.addEventListener('click', () => carregar(false));
+carregar(true);
+</script>
+"""
+
+
+def _data_iso(valor):
+    """'AAAA-MM-DD' validado (ou None)."""
+    try:
+        return datetime.date.fromisoformat(valor).isoformat() if valor else None
+    except ValueError:
+        return None
+
+def _codificar_cursor(data, vaga_id):
+    return base64.urlsafe_b64encode(json.dumps([data, vaga_id]).encode()).decode()
+
+def _decodificar_cursor(cursor):
+    try:
+        data, vaga_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(data), str(vaga_id)
+    except Exception:
+        return None
+
+def consultar_pagina(conn, plataforma=None, vip=False, desde=None, ate=None,
+                     cursor=None, limite=LIMITE_PAGINA):
+    """Uma página da lista (mais recentes primeiro) e o cursor da próxima (ou None)."""
+    condicoes, params = ["v.cluster_id = v.id"], []
+    if vip:
+        condicoes.append("v.vip_cluster = 1")
+    if desde:
+        condicoes.append("v.data_encontrada >= ?")
+        params.append(desde)
+    if ate:
+        condicoes.append("v.data_encontrada < date(?, '+1 day')")
+        params.append(ate)
+    if plataforma:
+        # vale se qualquer fonte do cluster for da plataforma
+        condicoes.append("EXISTS (SELECT 1 FROM vagas d WHERE d.cluster_id = v.id AND d.plataforma = ?)")
+        params.append(plataforma)
+    if cursor:
+        condicoes.append("(v.data_encontrada, v.id) < (?, ?)")
+        params.extend(cursor)
+    linhas = conn.execute(f"""
+        SELECT {COLUNAS_LISTA}, v.id AS id, v.data_encontrada AS chave
+        FROM vagas v
+        WHERE {" AND ".join(condicoes)}
+        ORDER BY v.data_encontrada DESC, v.id DESC
+        LIMIT ?
+    """, (*params, limite + 1)).fetchall()
+    proximo = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        proximo = _codificar_cursor(linhas[-1]['chave'], linhas[-1]['id'])
+    return linhas, proximo
+
+def versao_banco(conn):
+    """(versão, hora da última alteração) de `alteracoes`: muda a cada INSERT/UPDATE/DELETE em vagas."""
+    return tuple(conn.execute("SELECT versao, alterada FROM alteracoes WHERE id = 1").fetchone())
+
+
+class PainelHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, formato, *args):
+        pass   # sem uma linha por requisição no terminal
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        rotas = {"/": self._pagina, "/api/vagas": self._api_vagas,
+                 "/api/plataformas": self._api_plataformas}
+        rota = rotas.get(url.path)
+        if rota is None:
+            self.send_error(404)
+            return
+        params = {k: v[-1] for k, v in urllib.parse.parse_qs(url.query).items()}
+        conn = sqlite3.connect(f"file:{DB_NAME}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        try:
+            # ETag/Last-Modified pela última alteração (inserção, --rescore, VIP do
+            # cluster): sem mudança em vagas, 304 sem consulta
+            versao, ultima_data = versao_banco(conn)
+            etag = '"%s"' % hashlib.sha1(
+                f"{versao}|{ultima_data}|{url.path}|{url.query}".encode()).hexdigest()[:16]
+            modificado = None
+            if ultima_data:
+                momento = datetime.datetime.fromisoformat(str(ultima_data)).timestamp()
+                modificado = email.utils.formatdate(momento, usegmt=True)
+            if self._nao_modificado(etag, ultima_data):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            tipo, corpo = rota(conn, params)
+        finally:
+            conn.close()
+
+        dados = corpo.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(dados)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")   # sempre revalida, via ETag
+        if modificado:
+            self.send_header("Last-Modified", modificado)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _nao_modificado(self, etag, ultima_data):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            return etag in [t.strip() for t in if_none_match.split(",")]
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since and ultima_data:
+            try:
+                desde = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(datetime.datetime.fromisoformat(str(ultima_data)).timestamp()) <= desde
+        return False
+
+    def _api_vagas(self, conn, params):
+        try:
+            limite = max(1, min(int(params.get("limite", LIMITE_PAGINA)), LIMITE_MAXIMO))
+        except ValueError:
+            limite = LIMITE_PAGINA
+        linhas, proximo = consultar_pagina(
+            conn,
+            plataforma = params.get("plataforma") or None,
+            vip        = params.get("vip") == "1",
+            desde      = _data_iso(params.get("desde")),
+            ate        = _data_iso(params.get("ate")),
+            cursor     = _decodificar_cursor(params["cursor"]) if params.get("cursor") else None,
+            limite     = limite,
+        )
+        resposta = {
+            'vagas': [{
+                'id':         row['id'],
+                'cargo':      row['Cargo'],
+                'empresa':    row['Empresa'],
+                'local':      row['Local'],
+                'fontes':     [f for f in (row['Fonte'] or "").split(", ") if f],
+                'link':       row['Link'],
+                'links':      (row['Links'] or "").split(),
+                'vip':        bool(row['VIP']),
+                'encontrada': row['Encontrada em'],
+            } for row in linhas],
+            'proximo': proximo,
+            # mesma marcação da exportação HTML, pronta para o painel
+            'html': "".join(linha_html(row) for row in linhas),
+        }
+        return "application/json; charset=utf-8", json.dumps(resposta, ensure_ascii=False)
+
+    def _api_plataformas(self, conn, params):
+        contagem = dict(conn.execute(
+            "SELECT plataforma, COUNT(*) FROM vagas WHERE plataforma IS NOT NULL AND plataforma != '' "
+            "GROUP BY plataforma ORDER BY plataforma"
+        ).fetchall())
+        return "application/json; charset=utf-8", json.dumps(contagem, ensure_ascii=False)
+
+    def _pagina(self, conn, params):
+        total, vip_count = contar_vagas(conn)
+        plataformas = [p for (p,) in conn.execute(
+            "SELECT DISTINCT plataforma FROM vagas WHERE plataforma IS NOT NULL AND plataforma != '' "
+            "ORDER BY plataforma")]
+        opcoes = "".join(f'<option value="{html.escape(p)}">{html.escape(p)}</option>' for p in plataformas)
+        gerado_em = datetime.datetime.now().strftime("%d/%m/%Y %H:%M")
+        fim = FIM_HTML.replace("python ver_vagas.py --exportar", "python ver_vagas.py --serve")
+        pagina = (
+            INICIO_HTML.format(estilo=ESTILO_HTML + ESTILO_PAINEL, gerado_em=gerado_em,
+                               total=total, vip_count=vip_count)
+            + FILTROS_PAINEL.format(opcoes=opcoes)
+            + CABECALHO_TABELA_HTML
+            + fim.replace("</body>", SCRIPT_PAINEL + "</body>")
+        )
+        return "text/html; charset=utf-8", pagina
+
+
+def servir(porta=PORTA_PADRAO):
+    if not os.path.exists(DB_NAME):
+        print("\n Nenhum banco ainda. Execute: python rastreador.py")
+        return
+    servidor = http.server.ThreadingHTTPServer(("127.0.0.1", porta), PainelHandler)
+    print(f"\n  Painel em http://127.0.0.1:{porta}/  (Ctrl+C para sair)\n")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
 
 
 # ================================================================
@@ -252,11 +696,33 @@ def exportar_csv():
 if __name__ == "__main__":
     args = sys.argv[1:]
 
+    versao = versao_esquema()
+    if "--stats" not in args and (versao or 0) < ESQUEMA_MINIMO:
+        if versao is None:
+            print("\n Nenhum banco ainda. Execute: python rastreador.py")
+        else:
+            print(f"\n Banco na versão {versao}, este visualizador precisa da {ESQUEMA_MINIMO}.")
+            print(" Execute python rastreador.py uma vez (ou --rescore) para migrar o banco.")
+        sys.exit(1)
+
     if "--exportar" in args or "--html" in args:
         exportar_html()
     elif "--csv" in args:
         exportar_csv()
     elif "--links" in args:
         mostrar_com_links()
+    elif "--stats" in args:
+        mostrar_stats()
+    elif "--serve" in args:
+        # python ver_vagas.py --serve [porta]
+        posicao = args.index("--serve") + 1
+        servir(int(args[posicao]) if posicao < len(args) and args[posicao].isdigit() else PORTA_PADRAO)
+    elif "--buscar" in args:
+        # python ver_vagas.py --buscar "WMS AND SAP"
+        posicao = args.index("--buscar") + 1
+        if posicao < len(args):
+            buscar(args[posicao])
+        else:
+            print('\n Uso: python ver_vagas.py --buscar "WMS AND SAP"\n')
     else:
         mostrar_relatorio()